@@ -0,0 +1,116 @@
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import es3_improved
+from identical import identical_groups
+from instances import instance_files, load_tasks
+from corpus import Corpus, corpus_path
+from results_store import store_path, run_key, open_store, finished_row, save_row
+
+# Instances of a family solved concurrently with the es3_improved model.
+# Usage: python batch.py <family> [--workers N] [--shard k/N] [--corpus] [--resources R] [--store PATH] [--retry-errors]
+# Each worker process runs solve_es3 with its own solver, one instance at a time. The instances are taken in
+# sorted name order (instances.instance_files), shard k/N (k = 1..N) keeps every N-th of them starting at the
+# k-th, so N machines running shards 1/N .. N/N split a family without overlap. The rows are written by the
+# main process only, in the order of the instances, whatever order the workers finish in.
+# With --corpus the instances come from the packed input/<family>.corpus of corpus.py, in its order.
+# Finished runs are kept in a results_store.py store, a rerun skips them and only solves the rest.
+
+
+def shard_instances(input_folder, shard=None, packed=False):
+    # (name, load) of the instances, only those of shard (k, N) if given, load() returns the tasks
+    if packed:
+        corpus = Corpus(corpus_path(input_folder))
+        indices = corpus.shard(*shard) if shard is not None else range(len(corpus))
+        return [(corpus.name(k), lambda k=k: corpus.tasks(k)) for k in indices]
+    files = instance_files(input_folder)
+    if shard is not None:
+        k, n = shard
+        files = files[k - 1::n]
+    return [(os.path.basename(file_path), lambda file_path=file_path: load_tasks(file_path)) for file_path in files]
+
+
+def parse_shard(value):
+    k, n = (int(part) for part in value.split("/"))
+    if not 1 <= k <= n:
+        raise argparse.ArgumentTypeError(f"shard {value} is not k/N with 1 <= k <= N")
+    return k, n
+
+
+def run_config(resources):
+    # Everything besides the tasks that decides the result of a run: the formula settings, the steps run before
+    # the solver and the solver itself
+    return {**es3_improved.encoding_settings(), "variant": es3_improved.variant_type(), "solver": "glucose3",
+            "resources": resources, "budget": es3_improved.time_budget,
+            "presolve_windows": es3_improved.presolve_windows, "heuristic": es3_improved.heuristic,
+            "bound_checks": es3_improved.bound_checks}
+
+
+def solve_file(name, tasks, resources):
+    # Runs in a worker process, returns the result row without its ID
+    es3_improved.print_to_console_and_log(f"Processing {name}...")
+    res, solve_time, num_variables, num_clauses = es3_improved.solve_es3(tasks, resources)
+    es3_improved.flush_log()
+    return {
+        "Problem": name,
+        "Type": es3_improved.variant_type(),
+        "Time": solve_time,
+        "Result": res,
+        "Variables": num_variables,
+        "Clauses": num_clauses,
+        "Groups": len(identical_groups(tasks)),
+        "Reason": es3_improved.unsat_reason
+    }
+
+
+def process_input_files(input_folder, workers, shard=None, resources=200, path=store_path, retry_errors=False,
+                        packed=False):
+    instances = shard_instances(input_folder, shard, packed)
+    config = run_config(resources)
+    store = open_store(path)
+
+    rows = [None] * len(instances)
+    futures = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for k, (name, load) in enumerate(instances):
+            tasks = load()
+            key = run_key(tasks, config)
+            row = finished_row(store, key, retry_errors)
+            if row is not None:
+                es3_improved.print_to_console_and_log(f"Skipping {name}, already {row['Result']}")
+                rows[k] = False  # Written by an earlier run
+            else:
+                futures[pool.submit(solve_file, name, tasks, resources)] = (k, key)
+
+        # Each row is stored as soon as its run ends, the sink gets them in instance order
+        written = 0
+        for future in as_completed(futures):
+            k, key = futures[future]
+            rows[k] = future.result()
+            save_row(store, key, rows[k]["Problem"], config, rows[k])
+            while written < len(rows) and rows[written] is not None:
+                if rows[written] is not False:
+                    es3_improved.write_to_xlsx({"ID": es3_improved.id_counter, **rows[written]})
+                    es3_improved.id_counter += 1
+                written += 1
+    store.close()
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve the instances of input/<family> concurrently")
+    parser.add_argument("family")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shard", type=parse_shard, default=None, help="k/N, the k-th of N disjoint shards")
+    parser.add_argument("--corpus", action="store_true", help="read the instances from input/<family>.corpus")
+    parser.add_argument("--resources", type=int, default=200)
+    parser.add_argument("--store", default=store_path, help="SQLite store of the finished runs")
+    parser.add_argument("--retry-errors", action="store_true", help="rerun the stored runs that ended in an error")
+    args = parser.parse_args()
+
+    process_input_files("input/" + args.family, args.workers, args.shard, args.resources, args.store,
+                        args.retry_errors, args.corpus)
+
+    es3_improved.write_report()
+    es3_improved.close_log()
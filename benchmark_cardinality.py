@@ -0,0 +1,26 @@
+import sys
+
+import es3_improved
+import benchmark_harness
+from cardinality import encodings
+
+# Head-to-head of the D1/D2 exactly-one encodings on the es3_improved model.
+# Usage: python benchmark_cardinality.py <family> [<family> ...]   e.g. medium large long_duration
+# For every instance of input/<family> and every encoding, reports the encoding time, the formula size and
+# the solve time, then the mean per family and encoding (benchmark_harness.run). The rows are also written
+# to out/.
+
+resources = 200
+selected_encodings = encodings  # Names from cardinality.encodings to compare
+
+
+def encode(tasks, encoding, solver):
+    es3_improved.sat_solver = solver
+    es3_improved.eo_encoding = encoding
+    es3_improved.encode_problem_es3(tasks, resources)
+
+
+# Main execution
+if __name__ == "__main__":
+    benchmark_harness.run(sys.argv[1:], "cardinality", "Encoding", selected_encodings, encode)
+    es3_improved.close_log()
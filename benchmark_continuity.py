@@ -0,0 +1,40 @@
+import sys
+
+import es3_improved
+import es3_improved_pb_block
+import es3_s
+import benchmark_harness
+
+# Head-to-head of the continuity (C3-C5) encodings.
+# Usage: python benchmark_continuity.py <family> [<family> ...]   e.g. medium long_duration
+# For every instance of input/<family> and every variant, reports the encoding time, the formula size and
+# the solve time, then the mean per family and variant (benchmark_harness.run). The rows are also written
+# to out/.
+#   window: es3_improved, C41/C42/C51/C52 over every (t, t'') pair of the window, O(T * e) per task
+#   order:  es3_improved, z[i][t] <-> o[i][t] ^ -o[i][t - e_i] on order-encoded start times, O(T) per task
+#   block:  es3_improved_pb_block, block_encoding of the z window
+#   start:  es3_s, start variables s[i][t] linked to the z window
+
+resources = 200
+variants = ["window", "order", "block", "start"]
+
+
+def encode(tasks, variant, solver):
+    if variant in ("window", "order"):
+        es3_improved.sat_solver = solver
+        es3_improved.continuity_encoding = variant
+        es3_improved.encode_problem_es3(tasks, resources)
+    elif variant == "block":
+        es3_improved_pb_block.sat_solver = solver
+        es3_improved_pb_block.encode_problem_es3(tasks, resources)
+    elif variant == "start":
+        es3_s.sat_solver = solver
+        es3_s.encode_problem_es3(tasks, resources)
+    else:
+        raise ValueError(f"Unknown continuity variant: {variant} (expected one of {', '.join(variants)})")
+
+
+# Main execution
+if __name__ == "__main__":
+    benchmark_harness.run(sys.argv[1:], "continuity", "Continuity", variants, encode)
+    es3_improved.close_log()
@@ -0,0 +1,71 @@
+import os
+import time
+import pandas as pd
+from datetime import datetime
+from threading import Timer
+
+from pysat.solvers import Glucose3
+import es3_improved
+from instances import instance_files, load_tasks
+
+# The loop shared by the benchmark_*.py head-to-heads of one encoding option.
+# A benchmark passes the option's column name, the values to compare and encode(tasks, value, solver), which
+# builds the formula of an instance into solver with the option set to value. For every instance of
+# input/<family> and every value, run reports the encoding time, the formula size and the solve time, then
+# the mean per family and value. The rows are also written to out/<name>_<date>.xlsx.
+
+time_budget = 600  # Per solve, in seconds
+
+
+def run_value(tasks, value, encode):
+    solver = Glucose3()
+
+    start_time = time.time()
+    encode(tasks, value, solver)
+    encode_time = time.time() - start_time
+
+    timer = Timer(time_budget, solver.interrupt)
+    timer.start()
+    start_time = time.time()
+    result = solver.solve_limited(expect_interrupt=True)
+    solve_time = time.time() - start_time
+    timer.cancel()
+
+    row = {
+        "Result": "SAT" if result else "UNSAT" if result is False else "Time out",
+        "Encode time": encode_time,
+        "Solve time": solve_time,
+        "Variables": solver.nof_vars(),
+        "Clauses": solver.nof_clauses(),
+    }
+    solver.delete()
+    return row
+
+
+def run(families, name, option, values, encode, label=str, group_by=("Family",)):
+    # label(value) names a value in the log lines, the summary averages over group_by and the option
+    rows = []
+    for family in families:
+        for file_path in instance_files("input/" + family):
+            filename = os.path.basename(file_path)
+            tasks = load_tasks(file_path)
+
+            for value in values:
+                row = {"Family": family, "Problem": filename, option: value}
+                row.update(run_value(tasks, value, encode))
+                rows.append(row)
+                es3_improved.print_to_console_and_log(
+                    f"{family}/{filename} {label(value)}: {row['Result']}, encode {row['Encode time']:.3f}s, "
+                    f"solve {row['Solve time']:.3f}s, {row['Variables']} variables, {row['Clauses']} clauses")
+
+    df = pd.DataFrame(rows)
+    summary = df.groupby([*group_by, option], sort=False)[["Encode time", "Solve time", "Variables", "Clauses"]].mean()
+    es3_improved.print_to_console_and_log(summary.to_string())
+
+    output_path = 'out/'
+    if not os.path.exists(output_path): os.makedirs(output_path)
+    current_date = datetime.now().strftime('%Y-%m-%d')
+    excel_file_path = f"{output_path}/{name}_{current_date}.xlsx"
+    df.to_excel(excel_file_path, index=False, sheet_name='Results')
+    es3_improved.print_to_console_and_log(f"Results written to: {os.path.abspath(excel_file_path)}\n")
+    return df
@@ -0,0 +1,27 @@
+import sys
+
+import es3_improved
+import benchmark_harness
+
+# Value-precedence symmetry breaking (symmetry.py) on and off, on the es3_improved model.
+# Usage: python benchmark_symmetry.py <resources> <family> [<family> ...]   e.g. 5 medium large
+# The formula is built directly, without the presolve or the EDF fast path, so the UNSAT instances reach the
+# solver. For every instance reports the encoding time, the formula size and the solve time with and without
+# the symmetry breaking, then the mean per family, result and setting (benchmark_harness.run). The rows are
+# also written to out/.
+
+resources = 5
+
+
+def encode(tasks, symmetry, solver):
+    es3_improved.sat_solver = solver
+    es3_improved.resource_symmetry = symmetry
+    es3_improved.encode_problem_es3(tasks, resources)
+
+
+# Main execution
+if __name__ == "__main__":
+    resources = int(sys.argv[1])
+    benchmark_harness.run(sys.argv[2:], "symmetry", "Symmetry", (False, True), encode,
+                          label=lambda symmetry: f"symmetry {'on' if symmetry else 'off'}", group_by=("Family", "Result"))
+    es3_improved.close_log()
@@ -0,0 +1,36 @@
+import numpy as np
+
+# Relocatable templates of the block encodings of the es3_improved_pb_block* and *_blockrd scripts.
+# block_encoding(X, k, var_index) builds the same clauses for every task with the same window length
+# n = len(X) - 1 and duration k, only the variable IDs differ: position p of X stands for X[p], and an
+# auxiliary variable is var_index plus its rank. So each script's block_encoding is run once per (n, k) on
+# local IDs (X = [0, 1, ..., n], auxiliary variables from n + 1), and every task stamps out that template
+# with one array lookup for the X positions and one offset for the auxiliary variables.
+# The clauses are grouped by width for vectorized_clauses.add_clauses, in their original order within a group.
+
+templates = {}  # (block_encoding, n, k) -> ([(width, local literals as a rows x width int32 array)], auxiliary count)
+
+
+def block_template(encode, n, k):
+    key = (encode, n, k)
+    if key not in templates:
+        clauses, next_index = encode(list(range(n + 1)), k, n + 1)
+        widths = sorted({len(clause) for clause in clauses})
+        blocks = [(width, np.array([clause for clause in clauses if len(clause) == width], dtype=np.int32))
+                  for width in widths]
+        templates[key] = (blocks, next_index - (n + 1))
+    return templates[key]
+
+
+def stamp_block(encode, X, k, var_index):
+    # Same clauses (as arrays, one per width) and next variable index as encode(X, k, var_index)
+    n = len(X) - 1
+    blocks, num_auxiliary = block_template(encode, n, k)
+    X = np.asarray(X, dtype=np.int32)
+    stamped = []
+    for width, local in blocks:
+        variables = np.abs(local)
+        # Position p <= n is X[p] (X[0] = 0 keeps a 0 literal), above it an auxiliary variable
+        relocated = np.where(variables <= n, X[np.minimum(variables, n)], variables - (n + 1) + var_index)
+        stamped.append(np.sign(local) * relocated)
+    return stamped, var_index + num_auxiliary
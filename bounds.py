@@ -0,0 +1,69 @@
+import numpy as np
+
+# Necessary conditions checked in milliseconds before any encoding, on the identical resources seen as one
+# capacity of `resources`. Each returns the reason a schedule cannot exist, or None when the check passes.
+# Concurrency: the compulsory parts [d_i - e_i, r_i + e_i) (S2) run whatever the start times, so no time step
+# may hold more of them than there are resources.
+# Energy: over an interval [a, b) with a a release and b a deadline, a task inside [r_i, d_i) c [a, b) spends
+# all of e_i there, and any other task at least its compulsory part inside [a, b). With the compulsory profile
+# as a prefix sum and the contained tasks summed by release from the right, every (a, b) costs O(1).
+
+
+def capacity_violation(tasks, resources):
+    # The first violated condition of the instance, None if all pass
+    r = np.array([task[0] for task in tasks], dtype=np.int64)
+    e = np.array([task[1] for task in tasks], dtype=np.int64)
+    d = np.array([task[2] for task in tasks], dtype=np.int64)
+
+    short = np.flatnonzero(d - r < e)
+    if len(short) > 0:
+        return f"window of task {short[0] + 1} shorter than its duration"
+
+    profile = compulsory_profile(r, e, d)
+    reason = concurrency_violation(profile, resources)
+    if reason is None:
+        reason = energy_violation(r, e, d, profile, resources)
+    return reason
+
+
+def compulsory_profile(r, e, d):
+    # Number of compulsory parts running at each time step of [0, max d)
+    horizon = int(d.max())
+    start, end = d - e, r + e
+    has_part = start < end
+    profile = np.zeros(horizon + 1, dtype=np.int64)
+    np.add.at(profile, start[has_part], 1)
+    np.add.at(profile, end[has_part], -1)
+    return np.cumsum(profile)[:horizon]
+
+
+def concurrency_violation(profile, resources):
+    t = int(np.argmax(profile))
+    if profile[t] > resources:
+        return f"concurrency {profile[t]} > {resources} at time {t}"
+    return None
+
+
+def energy_violation(r, e, d, profile, resources):
+    # cumulative[t]: compulsory work before time t
+    cumulative = np.concatenate(([0], np.cumsum(profile)))
+    releases, release_index = np.unique(r, return_inverse=True)
+    deadlines, deadline_index = np.unique(d, return_inverse=True)
+    # Work of a contained task beyond its compulsory part, min(e, d - r - e)
+    extra = np.minimum(e, d - r - e)
+
+    # contained[k]: extra work of the tasks with r >= a and d = deadlines[k], grown as a moves left
+    contained = np.zeros(len(deadlines), dtype=np.int64)
+    order = np.argsort(release_index, kind='stable')
+    first = np.searchsorted(release_index[order], np.arange(len(releases) + 1))
+    for k in range(len(releases) - 1, -1, -1):
+        members = order[first[k]:first[k + 1]]
+        np.add.at(contained, deadline_index[members], extra[members])
+        a = releases[k]
+        work = np.cumsum(contained) + cumulative[deadlines] - cumulative[a]
+        capacity = resources * (deadlines - a)
+        violated = np.flatnonzero((deadlines > a) & (work > capacity))
+        if len(violated) > 0:
+            b = violated[0]
+            return f"energy {work[b]} > {capacity[b]} in [{a}, {deadlines[b]})"
+    return None
@@ -0,0 +1,64 @@
+from pysat.card import CardEnc, EncType
+
+# Named exactly-one encodings for D1/D2 (each task gets exactly one resource).
+# pblib hands any constraint with unit weights to its at-most-one encoder, whatever PB encoder is configured,
+# so the exactly_k(u[i], 1) of the pb scripts has always been pblib's default AMO encoding, here "nested".
+# pypblib is imported only when one of its encodings is used, the pysat ones run without it.
+
+pysat_encodings = {
+    'pairwise': EncType.pairwise,
+    'seqcounter': EncType.seqcounter,
+    'ladder': EncType.ladder,
+    'totalizer': EncType.totalizer,
+    'sorter': EncType.sortnetwrk,
+}
+
+pblib_encodings = {  # Names of the pblib.AMO_* constants
+    'nested': 'AMO_NESTED',
+    'commander': 'AMO_COMMANDER',
+    'bimander': 'AMO_BIMANDER',
+    'product': 'AMO_KPRODUCT',
+    'bdd': 'AMO_BDD',
+}
+
+encodings = list(pysat_encodings) + list(pblib_encodings)
+
+
+def pblib_encoder(encoding):
+    # A Pb2cnf with the named pblib at-most-one encoder
+    from pypblib import pblib
+    from pypblib.pblib import PBConfig, Pb2cnf
+    pbConfig = PBConfig()
+    pbConfig.set_AMO_Encoder(getattr(pblib, pblib_encodings[encoding]))
+    return Pb2cnf(pbConfig)
+
+
+def exactly_one(lits, id_variable, encoding='pairwise'):
+    # Returns the clauses of sum(lits) == 1 and the new last used variable.
+    # id_variable is the last used variable, the auxiliary variables of the encoding are numbered after it.
+    if encoding in pysat_encodings:
+        cnf = CardEnc.equals(lits=lits, bound=1, top_id=id_variable, encoding=pysat_encodings[encoding])
+        return cnf.clauses, max(id_variable, cnf.nv)
+
+    if encoding in pblib_encodings:
+        pb2 = pblib_encoder(encoding)
+        formula = []
+        max_var = pb2.encode_both([1] * len(lits), lits, 1, 1, formula, id_variable + 1)
+        return formula, max(id_variable, max_var)
+
+    raise ValueError(f"Unknown exactly-one encoding: {encoding} (expected one of {', '.join(encodings)})")
+
+
+def at_most_one(lits, id_variable, encoding='seqcounter'):
+    # Returns the clauses of sum(lits) <= 1 and the new last used variable, numbered as in exactly_one
+    if encoding in pysat_encodings:
+        cnf = CardEnc.atmost(lits=lits, bound=1, top_id=id_variable, encoding=pysat_encodings[encoding])
+        return cnf.clauses, max(id_variable, cnf.nv)
+
+    if encoding in pblib_encodings:
+        pb2 = pblib_encoder(encoding)
+        formula = []
+        max_var = pb2.encode_at_most_k(lits, 1, formula, id_variable + 1)
+        return formula, max(id_variable, max_var)
+
+    raise ValueError(f"Unknown at-most-one encoding: {encoding} (expected one of {', '.join(encodings)})")
@@ -0,0 +1,68 @@
+import numpy as np
+from cardinality import at_most_one
+
+# Cliques of the "must overlap" graph, for D0 and a stronger S1.
+# Tasks i and ip overlap whatever their start times iff each latest start d - e comes before the other's earliest
+# finish r + e (check_overlap), so they never share a resource. On the tasks with a compulsory part [d - e, r + e)
+# these pairs are an interval graph, and its maximal cliques come from one sweep over the parts: the tasks whose
+# parts contain a common time step. Per clique and resource one at-most-one constraint replaces the k(k - 1) / 2
+# pairwise D0 clauses. The members of a clique need distinct resources, so the largest clique can be pinned to
+# resources 0, 1, ..., and an instance with a clique larger than the resources is infeasible.
+# A sequential counter takes 3k - 4 clauses for k literals, so the pairwise clauses stay shorter below 6 tasks.
+
+min_clique = 6  # Smallest clique encoded with an at-most-one, the pairs of smaller ones stay pairwise
+
+
+def must_overlap_pairs(tasks, overlaps):
+    # (i, ip) pairs of the overlap index whose tasks must overlap, i < ip
+    if len(overlaps) == 0:
+        return []
+    latest_start = np.array([d - e for r, e, d in tasks], dtype=np.int64)
+    earliest_finish = np.array([r + e for r, e, d in tasks], dtype=np.int64)
+    i, ip = overlaps[:, 0], overlaps[:, 1]
+    mask = (latest_start[i] < earliest_finish[ip]) & (latest_start[ip] < earliest_finish[i])
+    return [tuple(pair) for pair in overlaps[mask, :2].tolist()]
+
+
+def must_overlap_cliques(tasks):
+    # Maximal cliques of the tasks with a compulsory part, lists of two or more task indices in increasing order.
+    # Parts are half-open, so at equal times the ends are swept before the starts.
+    events = sorted([(d - e, 1, i) for i, (r, e, d) in enumerate(tasks) if d - e < r + e] +
+                    [(r + e, 0, i) for i, (r, e, d) in enumerate(tasks) if d - e < r + e])
+
+    cliques = []
+    active = set()
+    grown = False  # A task started since the last end, the active set is then a maximal clique
+    for _, start, i in events:
+        if start:
+            active.add(i)
+            grown = True
+        else:
+            if grown and len(active) > 1:
+                cliques.append(sorted(active))
+            grown = False
+            active.discard(i)
+    return cliques
+
+
+def pairwise_clauses(u, pairs):
+    # D0: -u[i][j] v -u[ip][j] for every must-overlap pair and resource
+    resources = len(u[0]) if u else 0
+    return [[-u[i][j], -u[ip][j]] for i, ip in pairs for j in range(resources)]
+
+
+def clique_clauses(u, cliques, pairs, id_variable, encoding='seqcounter'):
+    # D0 over the cliques: one at-most-one per clique of min_clique or more tasks and resource, plus the pairwise
+    # clauses of the must-overlap pairs no such clique covers. Returns the clauses and the new last used variable,
+    # the auxiliary variables of the encoding are numbered after id_variable.
+    cliques = [clique for clique in cliques if len(clique) >= min_clique]
+    covered = {(i, ip) for clique in cliques for k, i in enumerate(clique) for ip in clique[k + 1:]}
+    resources = len(u[0]) if u else 0
+
+    clauses = []
+    for clique in cliques:
+        for j in range(resources):
+            amo_clauses, id_variable = at_most_one([u[i][j] for i in clique], id_variable, encoding)
+            clauses.extend(amo_clauses)
+    clauses.extend(pairwise_clauses(u, [pair for pair in pairs if pair not in covered]))
+    return clauses, id_variable
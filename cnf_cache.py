@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import hashlib
+import tempfile
+from itertools import chain
+import numpy as np
+
+from pysat.formula import CNF
+
+# Encoded formulas cached on disk, so comparing solvers or rerunning a family encodes each instance once.
+# Usage: python cnf_cache.py <key> [output.cnf]   (exports a cached formula as DIMACS)
+# A formula is keyed by a SHA-256 over the task list, the resources, the encoding settings and cache_version,
+# so any change to one of them misses the cache instead of reading a stale formula. It is stored as one
+# uncompressed .npz: the literals of all clauses as int32 with a 0 after each clause (the DIMACS layout without
+# the text), the u table and the z variables of each window in order, read back with one bulk read per array.
+
+cache_path = 'out/cnf_cache/'
+cache_version = 1  # Bump when an encoder or the file layout changes, the older entries are then never read
+
+
+class FormulaRecorder(CNF):
+    # Stands in for the solver while encode_problem_es3 runs, keeping the clauses
+    def add_clause(self, clause):
+        self.append(clause)
+
+    def append_formula(self, clauses):
+        self.extend(clauses)
+
+
+def formula_key(tasks, resources, settings):
+    payload = json.dumps({"version": cache_version, "tasks": [list(task) for task in tasks], "resources": resources,
+                          "settings": settings}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def formula_file(key):
+    return os.path.join(cache_path, f"{key}.npz")
+
+
+def save_formula(key, clauses, u, z):
+    if not os.path.exists(cache_path): os.makedirs(cache_path)
+    literals = np.fromiter(chain.from_iterable(chain(clause, (0,)) for clause in clauses), dtype=np.int32)
+    z_flat = np.fromiter((v for z_i in z for v in z_i.values()), dtype=np.int32)
+    # Written to a temporary file of its own and renamed, a crash never leaves a truncated entry behind and
+    # workers saving the same formula at once do not write into each other's file
+    with tempfile.NamedTemporaryFile(dir=cache_path, suffix=".npz", delete=False) as temporary:
+        np.savez(temporary, literals=literals, u=np.asarray(u, dtype=np.int32).reshape(len(z), -1), z=z_flat)
+    os.replace(temporary.name, formula_file(key))
+
+
+def load_formula(key, tasks):
+    # (clauses, u, z) of a cached formula, None on a miss. z is rebuilt over the windows of tasks.
+    path = formula_file(key)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as cached:
+        clauses, u, z_flat = split_clauses(cached["literals"]), cached["u"].tolist(), cached["z"].tolist()
+
+    z, k = [], 0
+    for r, e, d in tasks:
+        z.append(dict(zip(range(r, d), z_flat[k:k + d - r])))
+        k += d - r
+    return clauses, u, z
+
+
+def split_clauses(literals):
+    # Clause lists of a 0-terminated literal array
+    ends = np.flatnonzero(literals == 0).tolist()
+    flat = literals.tolist()
+    return [flat[start:end] for start, end in zip([0] + [end + 1 for end in ends[:-1]], ends)]
+
+
+def write_dimacs(clauses, path):
+    num_variables = max((abs(lit) for clause in clauses for lit in clause), default=0)
+    with open(path, 'w') as f:
+        f.write(f"p cnf {num_variables} {len(clauses)}\n")
+        for clause in clauses:
+            f.write(" ".join(map(str, clause)) + " 0\n")
+
+
+# Main execution
+if __name__ == "__main__":
+    key = sys.argv[1]
+    with np.load(formula_file(key)) as cached:
+        clauses = split_clauses(cached["literals"])
+    path = sys.argv[2] if len(sys.argv) > 2 else f"{key}.cnf"
+    write_dimacs(clauses, path)
+    print(f"Wrote {len(clauses)} clauses to {path}")
@@ -0,0 +1,49 @@
+import os
+import sys
+import logging
+from logging.handlers import MemoryHandler
+
+# Leveled logging to the console and console.log, with the file writes buffered.
+# print_to_console_and_log flushed console.log after every message, so dumping a schedule cost one write per
+# line. Here the file handler sits behind a MemoryHandler that writes buffer_records records at a time, or at
+# once for a warning or worse, and at close_log. Messages below the logger level (DEBUG by default for the
+# schedules) are dropped before they are formatted.
+# Worker processes do not run the exit handlers that write the buffer, so they call flush_log when done. The
+# buffer is also written before a fork, or the forked child would write the parent's records a second time.
+
+log_path = 'console.log'
+buffer_records = 4096  # Records held before console.log is written
+level = logging.INFO
+
+
+def get_logger(name='es3', path=log_path):
+    # The logger of the runners, its handlers are added on the first call only
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger.setLevel(level)
+        logger.propagate = False
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(logging.Formatter("%(message)s"))
+        file_handler = logging.FileHandler(path, mode='a')
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(console)
+        logger.addHandler(MemoryHandler(buffer_records, flushLevel=logging.WARNING, target=file_handler))
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(before=lambda: flush_log(name))
+    return logger
+
+
+def flush_log(name='es3'):
+    for handler in logging.getLogger(name).handlers:
+        handler.flush()
+
+
+def close_log(name='es3'):
+    # Writes the buffered records and closes console.log
+    logger = logging.getLogger(name)
+    for handler in list(logger.handlers):
+        target = handler.target if isinstance(handler, MemoryHandler) else None
+        handler.close()  # A MemoryHandler flushes to its target first
+        if target is not None:
+            target.close()
+        logger.removeHandler(handler)
@@ -0,0 +1,87 @@
+import os
+import sys
+import json
+import struct
+import numpy as np
+
+from instances import instance_files, load_array
+
+# All instances of a family in one file, read by index without listing or opening a directory.
+# Usage: python corpus.py <folder> [output]   (packs the folder into <folder>.corpus by default)
+# Layout: the magic bytes, the header length as a little-endian uint64, a JSON header, zero padding to a
+# multiple of 64 bytes, then the (r, e, d) rows of every instance one after the other as little-endian int32.
+# The header lists per instance its name, first row (offset), task count n, horizon T = max d, total work
+# sum e and generator seed (null when unknown, the generators do not record one). The rows are memory-mapped,
+# so reading instance k touches only its own pages.
+
+magic = b"NTSMRPK1"
+alignment = 64
+
+
+def corpus_path(input_folder):
+    return os.path.normpath(input_folder) + ".corpus"
+
+
+def pack(input_folder, path=None, seeds=None):
+    # Writes the instances of a folder (instances.instance_files order) to one corpus file, returns its path
+    path = path or corpus_path(input_folder)
+    arrays, entries, offset = [], [], 0
+    for file_path in instance_files(input_folder):
+        tasks = np.ascontiguousarray(load_array(file_path), dtype='<i4')
+        name = os.path.basename(file_path)
+        entries.append({"name": name, "offset": offset, "n": len(tasks),
+                        "T": int(tasks[:, 2].max()) if len(tasks) else 0, "work": int(tasks[:, 1].sum()),
+                        "seed": (seeds or {}).get(name)})
+        arrays.append(tasks)
+        offset += len(tasks)
+
+    header = json.dumps({"family": os.path.basename(os.path.normpath(input_folder)), "instances": entries}).encode()
+    start = len(magic) + 8 + len(header)
+    padding = -start % alignment
+    with open(path, 'wb') as f:
+        f.write(magic + struct.pack('<Q', len(header)) + header + b"\0" * padding)
+        for tasks in arrays:
+            f.write(tasks.tobytes())
+    return path
+
+
+class Corpus:
+    # A packed family opened for reading, instance k is tasks(k)
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            if f.read(len(magic)) != magic:
+                raise ValueError(f"{path} is not a corpus file")
+            length, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(length))
+        start = len(magic) + 8 + length
+        start += -start % alignment
+        self.family = header["family"]
+        self.instances = header["instances"]
+        rows = sum(entry["n"] for entry in self.instances)
+        self.rows = np.memmap(path, dtype='<i4', mode='r', offset=start, shape=(rows, 3)) if rows \
+            else np.zeros((0, 3), dtype='<i4')
+
+    def __len__(self):
+        return len(self.instances)
+
+    def name(self, k):
+        return self.instances[k]["name"]
+
+    def array(self, k):
+        # The (r, e, d) rows of instance k, a view of the mapped file
+        entry = self.instances[k]
+        return self.rows[entry["offset"]:entry["offset"] + entry["n"]]
+
+    def tasks(self, k):
+        return [tuple(task) for task in self.array(k).tolist()]
+
+    def shard(self, k, n):
+        # Indices of shard k/N (k = 1..N), every N-th instance from the k-th, as batch.shard_instances
+        return list(range(k - 1, len(self), n))
+
+
+# Main execution
+if __name__ == "__main__":
+    folder = sys.argv[1]
+    path = pack(folder, sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"Packed {len(Corpus(path))} instances of {folder} into {path}")
@@ -0,0 +1,305 @@
+import sys
+import heapq
+from typing import List
+
+# from pysat.formula import CNF
+from pysat.solvers import Glucose3, Solver
+from itertools import product
+import time
+from threading import Thread, Event
+import os
+import logging
+from pypblib import pblib
+from pypblib.pblib import PBConfig, Pb2cnf
+from var_pool import new_pool, time_variables
+from presolve import tighten_windows
+from instances import instance_files, load_tasks
+from result_sink import append_row, build_report
+from console_log import get_logger, close_log
+
+sat_solver = Glucose3
+time_budget = 1200  # Set your desired time budget in seconds
+presolve_windows = True  # Tighten the windows with presolve.tighten_windows before encoding
+type = "es5_cumulative"
+id_counter = 1
+id_variable: int
+
+# Open the log file in append mode
+logger = get_logger()
+
+def write_to_xlsx(result_dict):
+    # Append the result to the rows of the day, the Excel report is built from them by result_sink.build_report
+    sink_file_path = append_row(result_dict)
+    print_to_console_and_log(f"Result added to {os.path.abspath(sink_file_path)}\n")
+
+def write_report():
+    # Build the Excel report of the day from its rows, once per batch
+    report_file_path = build_report()
+    if report_file_path: print_to_console_and_log(f"Report written to {os.path.abspath(report_file_path)}")
+
+
+# Define a custom print function that writes to both console and log file
+def print_to_console_and_log(*args, level=logging.INFO, sep=" "):
+    if logger.isEnabledFor(level):
+        logger.log(level, sep.join(str(arg) for arg in args))
+
+def at_most_k(var: List[int], k):
+    global id_variable
+
+    pbConfig = PBConfig()
+    pbConfig.set_PB_Encoder(pblib.PB_BDD)
+    pb2 = Pb2cnf(pbConfig)
+    formula = []
+
+    max_var = pb2.encode_at_most_k(var, k, formula, id_variable + 1)
+
+    for clause in formula:
+        sat_solver.add_clause(clause)
+
+    # Update the global variable id_variable based on the new variables introduced by the encoding
+    id_variable = max(id_variable, max_var)
+
+def encode_problem_es3(tasks, resources):
+    # All resources are identical and each task runs in one contiguous interval, so the
+    # start times can be placed on `resources` machines iff at most `resources` tasks run
+    # at any time step (interval graphs are perfect). Only z is encoded here, the machines
+    # are assigned afterwards by assign_resources().
+    global id_variable
+    max_time = max(task[2] for task in tasks)
+
+    # Variables are numbered densely from one pool, in creation order
+    vpool = new_pool()
+
+    # Variables z[i][t] for task i accessing some resource at time t
+    z = time_variables(vpool, tasks)
+
+    # Calculate id_variable
+    id_variable = vpool.top
+
+    # Symmetry breaking 2: if each task i has t in range(r_max, d_min), then z[i][t] = True
+    for i in range(len(tasks)):
+        for t in range(tasks[i][2] - tasks[i][1], tasks[i][0] + tasks[i][1]):
+            sat_solver.add_clause([z[i][t]])
+            # print(f"Added clause S2: z{i+1}{t}")
+
+    # D3: At most `resources` tasks can access a resource at each time step
+    for t in range(max_time):
+        z_list = [z[i][t] for i in range(len(tasks)) if tasks[i][0] <= t < tasks[i][2]]
+        if len(z_list) > resources:
+            at_most_k(z_list, resources)
+            # print(f"Added clause D3: at most {resources} of {z_list}")
+
+    for i in range(len(tasks)):
+        clause = []
+        for t in range(tasks[i][0], tasks[i][2] - tasks[i][1] + 1):
+            clause.append(z[i][t])
+        sat_solver.add_clause(clause)
+        # print(f"Added clause C3: {clause}")
+
+    for i in range(len(tasks)):
+        for t in range(tasks[i][0] + 1, tasks[i][0] + tasks[i][1]):
+            sat_solver.add_clause([-z[i][tasks[i][0]], z[i][t]])
+            # print(f"Added clause C41: -z{i+1}{tasks[i][0]} z{i+1}{t}")
+
+        for t in range (tasks[i][0] + tasks[i][1], tasks[i][2]):
+            sat_solver.add_clause([-z[i][tasks[i][0]], -z[i][t]])
+            # print(f"Added clause C42: -z{i+1}{tasks[i][0]} -z{i+1}{t}")
+
+        for t in range(tasks[i][0], tasks[i][2] - tasks[i][1]):
+            for tpp in range(t+1, t + tasks[i][1] + 1):
+                if tpp < max_time:
+                    sat_solver.add_clause([z[i][t], -z[i][t+1], z[i][tpp]])
+                    # print(f"Added clause C51: z{i+1}{t}, -z{i+1}{t+1}, z{i+1}{tpp}")
+
+            for tpp in range(t + tasks[i][1] + 1, tasks[i][2]):
+                if tpp < max_time:
+                    sat_solver.add_clause([z[i][t], -z[i][t+1], -z[i][tpp]])
+                    # print(f"Added clause C52: z{i+1}{t}, -z{i+1}{t+1}, -z{i+1}{tpp}")
+
+    return z
+
+def assign_resources(tasks, model, z, resources):
+    # Greedy interval colouring: take the tasks by start time and give each one the
+    # lowest-numbered resource that is free at its start
+    start_times = {}
+    for i, task in enumerate(tasks):
+        for t in range(task[0], task[2]):
+            if model[z[i][t] - 1] > 0:
+                start_times[i] = t
+                break
+
+    task_resource = {}
+    free_resources = list(range(resources))
+    busy_resources = []  # heap of (finish time, resource)
+    for i in sorted(start_times, key=lambda i: start_times[i]):
+        while busy_resources and busy_resources[0][0] <= start_times[i]:
+            heapq.heappush(free_resources, heapq.heappop(busy_resources)[1])
+        if not free_resources:
+            print_to_console_and_log(f"Error: No free resource for task {i+1} at time {start_times[i]}", level=logging.ERROR)
+            break
+        j = heapq.heappop(free_resources)
+        task_resource[i] = j
+        heapq.heappush(busy_resources, (start_times[i] + tasks[i][1], j))
+
+    return task_resource
+
+def solve_with_timeout(tasks, resources, result_container, finished_event):
+    global sat_solver
+    sat_solver = Glucose3()
+    
+    try:
+        z = encode_problem_es3(tasks, resources)
+        result = sat_solver.solve()
+        
+        if result:
+            model = sat_solver.get_model()
+            result_container['status'] = 'SAT'
+            result_container['model'] = model
+            result_container['z'] = z
+        else:
+            result_container['status'] = 'UNSAT'
+            
+    except Exception as e:
+        result_container['status'] = 'ERROR'
+        result_container['error'] = str(e)
+    
+    finished_event.set()
+
+def solve_es3(tasks, resources):
+    global sat_solver
+    
+    result_container = {}
+    finished_event = Event()
+    
+    start_time = time.time()
+    # Presolve: tighten the windows, an instance shown infeasible never reaches the solver
+    if presolve_windows:
+        tasks = tighten_windows(tasks, resources)
+        if tasks is None:
+            print_to_console_and_log("UNSAT (presolve)")
+            return "UNSAT", time.time() - start_time, 0, 0
+
+    solver_thread = Thread(target=solve_with_timeout, args=(tasks, resources, result_container, finished_event))
+    solver_thread.start()
+    
+    # Wait for either completion or timeout
+    finished = finished_event.wait(timeout=time_budget)
+    solve_time = time.time() - start_time
+    
+    if not finished:
+        sat_solver.interrupt()
+        solver_thread.join()  # Wait for thread to clean up
+        sat_solver.delete()
+        return "Time out", solve_time, 0, 0
+        
+    if result_container.get('status') == 'SAT':
+        model = result_container['model']
+        z = result_container['z']
+        task_resource = assign_resources(tasks, model, z, resources)
+        
+        print("SAT")
+        if logger.isEnabledFor(logging.DEBUG):
+            for i in range(len(tasks)):
+                if i in task_resource:
+                    print_to_console_and_log(f"Task {i+1} is assigned to resource {task_resource[i]+1}", level=logging.DEBUG)
+                for t in range(tasks[i][0], tasks[i][2]):
+                    if model[z[i][t] - 1] > 0:
+                        print_to_console_and_log(f"Task {i+1} is accessing a resource at time {t}", level=logging.DEBUG)
+        
+        if not validate_solution(tasks, model, z, task_resource, resources):
+            sys.exit(1)
+        
+
+        number_of_variables = sat_solver.nof_vars()
+        number_of_clauses = sat_solver.nof_clauses()
+        sat_solver.delete()
+        return "SAT", solve_time, number_of_variables, number_of_clauses
+    
+    elif result_container.get('status') == 'UNSAT':
+        print_to_console_and_log("UNSAT")
+        number_of_variables = sat_solver.nof_vars()
+        number_of_clauses = sat_solver.nof_clauses()
+        sat_solver.delete()
+        return "UNSAT", solve_time, number_of_variables, number_of_clauses
+    
+    else:
+        print_to_console_and_log(f"Error: {result_container.get('error')}", level=logging.ERROR)
+        sat_solver.delete()
+        return "ERROR", solve_time, 0, 0
+
+def validate_solution(tasks, model, z, task_resource, resources):
+    task_times = {}
+    resource_usage = {j: [] for j in range(resources)}
+
+    for i, task in enumerate(tasks):
+        task_times[i] = [t for t in range(task[0], task[2]) if model[z[i][t] - 1] > 0]
+        
+        if task_resource.get(i) is not None:
+            resource_usage[task_resource[i]].extend(task_times[i])
+
+    # Check constraints
+    for i, task in enumerate(tasks):
+        # Check if task is assigned to exactly one resource
+        if i not in task_resource:
+            print_to_console_and_log(f"Error: Task {i} is not assigned to any resource", level=logging.ERROR)
+            return False
+
+        # Check if task starts after its release time
+        if task_times[i][0] < task[0]:
+            print_to_console_and_log(f"Error: Task {i+1} starts before its release time", level=logging.ERROR)
+            return False
+
+        # Check if task finishes before its deadline
+        if task_times[i][-1] >= task[2]:
+            print_to_console_and_log(f"Error: Task {i+1} finishes after its deadline", level=logging.ERROR)
+            return False
+
+        # Check if task execution is continuous and matches the execution time
+        if len(task_times[i]) != task[1] or any(task_times[i][j+1] - task_times[i][j] != 1 for j in range(len(task_times[i])-1)):
+            print_to_console_and_log(f"Error: Task {i+1} execution is not continuous or doesn't match execution time", level=logging.ERROR)
+            return False
+
+    # Check if any resource is used by multiple tasks at the same time
+    for j, times in resource_usage.items():
+        if len(times) != len(set(times)):
+            print_to_console_and_log(f"Error: Resource {j+1} is used by multiple tasks at the same time", level=logging.ERROR)
+            return False
+
+    print_to_console_and_log("Solution is valid!")
+    return True
+
+def process_input_files(input_folder, resources=200):
+    global id_counter, type
+
+    # results = {}
+    for file_path in instance_files(input_folder):
+        filename = os.path.basename(file_path)
+        tasks = load_tasks(file_path)
+        num_tasks = len(tasks)
+        print_to_console_and_log("tasks:", tasks, level=logging.DEBUG)
+
+        print_to_console_and_log(f"Processing {filename}...")
+        # res, solve_time, num_variables, num_clauses = solve_es3(tasks, num_tasks)
+        res, solve_time, num_variables, num_clauses = solve_es3(tasks, resources)
+        result_dict = {
+            "ID": id_counter,
+            "Problem": os.path.basename(filename),
+            "Type": type,
+            "Time": solve_time,
+            "Result": res,
+            "Variables": num_variables,
+            "Clauses": num_clauses
+        }
+        write_to_xlsx(result_dict)
+        id_counter += 1
+
+    write_report()
+
+    # return results
+
+# Main execution
+input_folder = "input/" + sys.argv[1]
+# input_folder = "input/small"
+process_input_files(input_folder)
+
+close_log()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import heapq
+
+# Earliest-deadline-first list scheduling over the identical resources, as a fast path before the SAT solver.
+# Time jumps from event to event (a release or a resource becoming free). At each event the released tasks are
+# taken by earliest deadline and each goes to the free resource that has been idle the shortest time (best fit),
+# which keeps the long idle gaps for later tasks. A task whose latest start d - e passes unscheduled is missed.
+
+
+def edf_schedule(tasks, resources):
+    # Returns the (resource, start) of every task, None for the missed ones
+    schedule = [None] * len(tasks)
+    by_release = sorted(range(len(tasks)), key=lambda i: tasks[i][0])
+    free_at = [0] * resources  # Time step from which each resource is free
+    ready = []  # (deadline, i) of the released tasks not yet scheduled
+    k = 0
+    t = tasks[by_release[0]][0] if tasks else 0
+    while k < len(by_release) or ready:
+        while k < len(by_release) and tasks[by_release[k]][0] <= t:
+            i = by_release[k]
+            heapq.heappush(ready, (tasks[i][2], i))
+            k += 1
+
+        free = sorted((j for j in range(resources) if free_at[j] <= t), key=lambda j: -free_at[j])
+        while ready and free:
+            deadline, i = heapq.heappop(ready)
+            if t + tasks[i][1] > deadline:
+                continue  # Missed, too late to start
+            j = free.pop(0)
+            schedule[i] = (j, t)
+            free_at[j] = t + tasks[i][1]
+        ready = [(deadline, i) for deadline, i in ready if t + tasks[i][1] <= deadline]
+        heapq.heapify(ready)
+
+        # Next event: a release, or a resource becoming free while tasks are waiting
+        events = [free_at[j] for j in range(resources) if free_at[j] > t] if ready else []
+        if k < len(by_release):
+            events.append(tasks[by_release[k]][0])
+        if not events:
+            break
+        t = min(events)
+    return schedule
+
+
+def schedule_phases(tasks, schedule, u, z):
+    # Preferred phases for the solver from a (partial) schedule: the chosen u[i][j] and the z[i][t] of its run
+    # true, the other resources and time steps of a scheduled task false, nothing for the missed tasks
+    phases = []
+    for i, entry in enumerate(schedule):
+        if entry is None:
+            continue
+        j, start = entry
+        phases.extend(u[i][jp] if jp == j else -u[i][jp] for jp in range(len(u[i])))
+        phases.extend(z[i][t] if start <= t < start + tasks[i][1] else -z[i][t] for t in z[i])
+    return phases
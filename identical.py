@@ -0,0 +1,62 @@
+from collections import defaultdict
+from symmetry import s1_tasks
+
+# Ordering of identical tasks.
+# Tasks with the same (r, e, d) can swap their start times and resources in any schedule, so within a group
+# a lower index gets the earlier start, and on equal starts the lower resource (lex order on (start, resource)).
+# S1 pins only its first `resources` tasks, which can split a group. Given the resources, the pinned tasks (or
+# those of fixed_tasks, as the clique S1 of cliques.py) are grouped apart from the others, so renaming tasks inside
+# a group never moves a pin. precedence_order keeps
+# index order inside a group, so this agrees with S1 and with the value precedence of symmetry.py.
+
+
+def identical_groups(tasks, resources=None, fixed_tasks=None):
+    # Lists of two or more task indices with the same (r, e, d), each in increasing order.
+    # With resources, also split by whether the task is among the first `resources` pinned ones.
+    if fixed_tasks is None:
+        fixed_tasks = s1_tasks(tasks)
+    pinned = set(fixed_tasks[:resources]) if resources is not None else set()
+    groups = defaultdict(list)
+    for i, task in enumerate(tasks):
+        groups[tuple(task), i in pinned].append(i)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def consecutive_pairs(groups):
+    return [(group[k], group[k + 1]) for group in groups for k in range(len(group) - 1)]
+
+
+def starts_at(z, i, t, release):
+    # Literals whose conjunction says task i starts at t: z[i][t] and, after the release time, -z[i][t - 1]
+    return [z[i][t]] + ([-z[i][t - 1]] if t > release else [])
+
+
+def start_order_clauses(tasks, z, groups):
+    # s_i <= s_ip: if ip starts at t, i has run at some time step up to t
+    clauses = []
+    for i, ip in consecutive_pairs(groups):
+        r, e, d = tasks[i]
+        for t in range(r, d - e + 1):
+            clauses.append([-lit for lit in starts_at(z, ip, t, r)] + [z[i][tp] for tp in range(r, t + 1)])
+    return clauses
+
+
+def resource_order_clauses(vpool, tasks, u, z, groups, name='q'):
+    # On equal starts, resource of i < resource of ip, with q[i][j] = "task i uses a resource <= j" numbered
+    # from the pool under keys (name, i, j) for the lower task of each pair
+    clauses = []
+    for i, ip in consecutive_pairs(groups):
+        r, e, d = tasks[i]
+        resources = len(u[i])
+        q = [vpool.id((name, i, j)) for j in range(resources - 1)]
+        for j in range(resources - 1):
+            clauses.append([-u[i][j], q[j]])
+            clauses.append([-q[j], u[i][j]] + ([q[j - 1]] if j > 0 else []))
+            if j > 0:
+                clauses.append([-q[j - 1], q[j]])
+
+        for t in range(r, d - e + 1):
+            same_start = starts_at(z, i, t, r) + starts_at(z, ip, t, r)
+            for j in range(resources):
+                clauses.append([-lit for lit in same_start] + [-u[ip][j]] + ([q[j - 1]] if j > 0 else []))
+    return clauses
@@ -0,0 +1,83 @@
+import os
+import re
+import sys
+import ast
+import numpy as np
+
+# Instance files in three formats, all loaded as an n x 3 int32 array of (r, e, d).
+# Usage: python instances.py <folder> [npy|csv]   (converts every .txt instance of the folder, npy by default)
+# .txt is the original format: the number of tasks on the first line, the Python list of tuples on the second.
+# It is parsed in bulk by dropping the brackets and reading the numbers with NumPy instead of ast.literal_eval,
+# which builds every tuple as a Python object first. .npy holds the array itself and is memory-mapped, so a
+# loader touches only the pages it reads. .csv has one "r,e,d" line per task and an optional header.
+# The runners list the instances of a folder with instance_files, which takes a .npy over a .txt of the same name.
+
+formats = [".npy", ".csv", ".txt"]  # By preference when a folder holds an instance in several formats
+not_a_number = re.compile(r"[^0-9,\-]")
+
+
+def load_array(path):
+    # The (r, e, d) rows of an instance as an int32 array, memory-mapped for .npy
+    extension = os.path.splitext(path)[1]
+    if extension == ".npy":
+        tasks = np.load(path, mmap_mode='r')
+    elif extension == ".csv":
+        with open(path, 'r') as f:
+            first = f.readline()
+            header = 1 if re.search(r"[A-Za-z]", first) else 0
+        tasks = np.loadtxt(path, dtype=np.int32, delimiter=",", skiprows=header, ndmin=2)
+    else:
+        tasks = read_text(path)
+    if tasks.ndim != 2 or tasks.shape[1] != 3:
+        raise ValueError(f"{path}: expected n x 3 tasks, got shape {tasks.shape}")
+    return tasks
+
+
+def read_text(path):
+    with open(path, 'r') as f:
+        num_tasks = int(f.readline().strip())
+        line = f.readline()
+    try:
+        values = np.array(not_a_number.sub("", line).strip(",").split(","), dtype=np.int32)
+    except ValueError:
+        values = np.empty(0, dtype=np.int32)
+    if len(values) != 3 * num_tasks:
+        # Not a plain list of triples, fall back to the Python parser
+        values = np.array(ast.literal_eval(line.strip()), dtype=np.int32).reshape(-1)
+    return values.reshape(-1, 3)
+
+
+def load_tasks(path):
+    # The tasks as the list of (r, e, d) tuples the encoders take
+    return [tuple(task) for task in load_array(path).tolist()]
+
+
+def instance_files(input_folder):
+    # Sorted instance paths of a folder, one per name, in the preferred format
+    found = {}
+    for filename in os.listdir(input_folder):
+        stem, extension = os.path.splitext(filename)
+        if extension in formats:
+            if stem not in found or formats.index(extension) < formats.index(os.path.splitext(found[stem])[1]):
+                found[stem] = filename
+    return [os.path.join(input_folder, found[stem]) for stem in sorted(found)]
+
+
+def convert(path, extension=".npy"):
+    # Writes the instance next to path in the given format, returns the new path
+    tasks = load_array(path)
+    target = os.path.splitext(path)[0] + extension
+    if extension == ".npy":
+        np.save(target, np.ascontiguousarray(tasks, dtype=np.int32))
+    else:
+        np.savetxt(target, tasks, fmt="%d", delimiter=",", header="r,e,d", comments="")
+    return target
+
+
+# Main execution
+if __name__ == "__main__":
+    folder = sys.argv[1]
+    extension = "." + (sys.argv[2] if len(sys.argv) > 2 else "npy")
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith(".txt"):
+            print(f"{filename} -> {os.path.basename(convert(os.path.join(folder, filename), extension))}")
@@ -0,0 +1,61 @@
+import multiprocessing
+
+try:
+    import resource
+except ImportError:  # Windows, no RLIMIT_AS
+    resource = None
+
+# Solves in a child process with a hard wall-clock and memory limit.
+# A thread running the solver cannot be stopped once the solver ignores interrupt() (OR-Tools, CPLEX, Gurobi) or
+# is still encoding under the GIL. A child process is terminated at its deadline whatever it is doing, and its
+# address space is capped with RLIMIT_AS, so a runaway encoding fails with a MemoryError in the child instead of
+# taking the whole batch down. The result comes back over a pipe, so it has to be picklable.
+
+grace_period = 5  # Seconds between terminate() and kill() of a child that outlived its deadline
+
+
+def run_isolated(target, args, time_limit, memory_limit=None):
+    # Calls target(*args) in a child process. Returns (status, value) with status "OK" (value is the result),
+    # "Time out", "Memory out" or "ERROR" (value is the error message).
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    child = multiprocessing.Process(target=child_main, args=(sender, target, args, memory_limit), daemon=True)
+    child.start()
+    sender.close()
+
+    try:
+        if not receiver.poll(max(time_limit, 0)):
+            stop(child)
+            return "Time out", None
+        try:
+            status, value = receiver.recv()
+        except EOFError:
+            # Died without an answer, killed by the system or crashed in native code
+            child.join()
+            return "ERROR", f"solve process exited with code {child.exitcode}"
+        child.join()
+        return status, value
+    finally:
+        receiver.close()
+        if child.is_alive():
+            stop(child)
+
+
+def child_main(sender, target, args, memory_limit):
+    if memory_limit is not None and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    try:
+        answer = ("OK", target(*args))
+    except MemoryError:
+        answer = ("Memory out", None)
+    except Exception as e:
+        answer = ("ERROR", str(e))
+    sender.send(answer)
+    sender.close()
+
+
+def stop(child):
+    child.terminate()
+    child.join(grace_period)
+    if child.is_alive():
+        child.kill()
+        child.join()
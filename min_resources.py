@@ -0,0 +1,158 @@
+import sys
+import os
+import time
+from threading import Timer
+
+from pysat.card import ITotalizer
+from pysat.solvers import Glucose3
+import es3_improved
+from instances import instance_files, load_tasks
+
+# Smallest number of resources for each instance, on one live solver.
+# Usage: python min_resources.py <family> [binary|linear]
+# The es3_improved model is encoded once for an upper bound R of resources, with an activation literal a[j]
+# per resource (u[i][j] -> a[j]). Probing k resources is solve(assumptions=[-a[j] for j >= k]), so the
+# clauses learned by earlier probes are kept instead of re-encoding the instance for every k.
+# A redundant totalizer over the z[i][t] of each time step bounds the running tasks by the same k. Without it
+# every probe below the optimum needs a pigeonhole proof over the identical resources.
+
+search = "binary"  # "binary" or "linear" (k = lower bound, lower bound + 1, ... until SAT)
+time_budget = 1200  # For the whole search of an instance, in seconds
+probe_budget = 300  # Per probe, a probe that runs out moves the search up but the result is then not proven optimal
+type = "es5_min"
+id_counter = 1
+
+
+def resource_bounds(tasks):
+    # Lower bound: the most compulsory parts [d_i - e_i, r_i + e_i) sharing a time step, these tasks run at once.
+    # Upper bound: the most windows [r_i, d_i) sharing a time step, with that many resources every task can start
+    # at its release time without ever exceeding them (interval graphs are perfect).
+    def depth(intervals):
+        events = sorted([(start, 1) for start, end in intervals if start < end] +
+                        [(end, -1) for start, end in intervals if start < end])
+        current = best = 0
+        for _, delta in events:
+            current += delta
+            best = max(best, current)
+        return best
+
+    lower = depth([(d - e, r + e) for r, e, d in tasks])
+    upper = depth([(r, d) for r, e, d in tasks])
+    return max(lower, 1), max(upper, 1)
+
+
+def probe(sat_solver, activation, totalizers, k, deadline):
+    # Solve with only the first k resources active, returns (result, model, time)
+    assumptions = [-a for a in activation[k:]] + [-tot.rhs[k] for tot in totalizers if k < len(tot.rhs)]
+    timer = Timer(max(min(deadline - time.time(), probe_budget), 0), sat_solver.interrupt)
+    timer.start()
+    start_time = time.time()
+    result = sat_solver.solve_limited(assumptions=assumptions, expect_interrupt=True)
+    probe_time = time.time() - start_time
+    timer.cancel()
+    sat_solver.clear_interrupt()
+
+    if result is None:
+        return "Time out", None, probe_time
+    return ("SAT", sat_solver.get_model(), probe_time) if result else ("UNSAT", None, probe_time)
+
+
+def minimize_resources(tasks):
+    start_time = time.time()
+    deadline = start_time + time_budget
+    lower, upper = resource_bounds(tasks)
+
+    sat_solver = Glucose3()
+    es3_improved.sat_solver = sat_solver
+    u, z = es3_improved.encode_problem_es3(tasks, upper)
+
+    # Activation literal a[j] for resource j, numbered after every variable of the encoding
+    top = sat_solver.nof_vars()
+    activation = [top + j + 1 for j in range(upper)]
+    for i in range(len(tasks)):
+        for j in range(upper):
+            sat_solver.add_clause([-u[i][j], activation[j]])
+
+    # rhs[k] of a totalizer is true when more than k of its literals are, only needed where more than lower can run
+    top = activation[-1]
+    totalizers = []
+    for t in range(max(task[2] for task in tasks)):
+        z_list = [z[i][t] for i in range(len(tasks)) if tasks[i][0] <= t < tasks[i][2]]
+        if len(z_list) > lower:
+            tot = ITotalizer(lits=z_list, ubound=upper, top_id=top)
+            sat_solver.append_formula(tot.cnf.clauses)
+            top = tot.top_id
+            totalizers.append(tot)
+    num_variables = sat_solver.nof_vars()
+    num_clauses = sat_solver.nof_clauses()
+
+    # upper resources always suffice unless a task does not fit its own window, which k cannot fix
+    best, best_model = None, None
+    probes = []
+    lo, hi = lower, upper
+    proven = lower  # Every k below this is known to be UNSAT
+    while lo <= hi and time.time() < deadline:
+        k = lo if search == "linear" else (lo + hi) // 2
+        result, model, probe_time = probe(sat_solver, activation, totalizers, k, deadline)
+        probes.append((k, result, probe_time))
+        es3_improved.print_to_console_and_log(f"  {k} resources: {result} ({probe_time:.3f}s)")
+        if result == "SAT":
+            best, best_model = k, model
+            if search == "linear":
+                break
+            hi = k - 1
+        else:
+            if result == "UNSAT":
+                proven = max(proven, k + 1)  # fewer resources are UNSAT as well
+            lo = k + 1
+
+    total_time = time.time() - start_time
+    if best is not None and not es3_improved.validate_solution(tasks, best_model, u, z, best):
+        sys.exit(1)
+    sat_solver.delete()
+    for tot in totalizers:
+        tot.delete()
+
+    if best is not None and proven == best:
+        status = "Optimal"
+    elif best is None and proven > upper:
+        status = "UNSAT"
+    else:
+        status = "Time out"  # best, if any, is only an upper bound
+    return status, best, probes, total_time, num_variables, num_clauses
+
+
+def process_input_files(input_folder):
+    global id_counter
+
+    for file_path in instance_files(input_folder):
+        filename = os.path.basename(file_path)
+        tasks = load_tasks(file_path)
+
+        es3_improved.print_to_console_and_log(f"Processing {filename}...")
+        status, best, probes, total_time, num_variables, num_clauses = minimize_resources(tasks)
+        es3_improved.print_to_console_and_log(f"{status}: {best} resources in {total_time:.3f}s, {len(probes)} probes")
+        result_dict = {
+            "ID": id_counter,
+            "Problem": os.path.basename(filename),
+            "Type": f"{type}_{search}",
+            "Time": total_time,
+            "Result": status,
+            "Variables": num_variables,
+            "Clauses": num_clauses,
+            "Resources": best,
+            "Probes": "; ".join(f"{k}:{result}:{probe_time:.3f}" for k, result, probe_time in probes)
+        }
+        es3_improved.write_to_xlsx(result_dict)
+        id_counter += 1
+
+
+# Main execution
+if __name__ == "__main__":
+    input_folder = "input/" + sys.argv[1]
+    if len(sys.argv) > 2:
+        search = sys.argv[2]
+    process_input_files(input_folder)
+
+    es3_improved.write_report()
+    es3_improved.close_log()
@@ -0,0 +1,38 @@
+# Continuity (C3-C5) with an order-encoded start time instead of the pairwise z clauses.
+# With o[i][t] = "task i starts at or before t" (var_pool.order_variables), a task runs at t exactly when it
+# has started by t and had not started by t - e_i:
+#   z[i][t] <-> o[i][t] ^ -o[i][t - e_i]
+# which takes a constant number of clauses per time step, so O(d_i - r_i) per task instead of O(T * e_i).
+
+
+def order_clauses(tasks, z, o):
+    clauses = []
+    for i, (r, e, d) in enumerate(tasks):
+        last = d - e  # Latest start, o[i][t] is true from here on
+        if last < r:
+            clauses.append([])  # No start time fits the window
+            continue
+
+        # The start is unique: o[i][t] -> o[i][t + 1]
+        for t in range(r, last - 1):
+            clauses.append([-o[i][t], o[i][t + 1]])
+
+        for t in range(r, d):
+            started = [o[i][t]] if t < last else []  # Empty when o[i][t] is true
+            before = [o[i][t - e]] if t - e >= r else []  # Empty when o[i][t - e] is false
+
+            # z[i][t] -> o[i][t] and z[i][t] -> -o[i][t - e]
+            for lit in started:
+                clauses.append([-z[i][t], lit])
+            for lit in before:
+                clauses.append([-z[i][t], -lit])
+            # o[i][t] ^ -o[i][t - e] -> z[i][t]
+            clauses.append([-lit for lit in started] + before + [z[i][t]])
+
+            # Redundant, an edge of the run fixes the start as the C5 clauses do:
+            # -z[i][t - 1] ^ z[i][t] -> -o[i][t - 1] (start t) and z[i][t] ^ -z[i][t + 1] -> o[i][t - e + 1] (start t - e + 1)
+            if t > r:
+                clauses.append([z[i][t - 1], -z[i][t]] + ([-o[i][t - 1]] if t - 1 < last else []))
+            if t + 1 < d and t - e + 1 < last:
+                clauses.append([-z[i][t], z[i][t + 1]] + ([o[i][t - e + 1]] if t - e + 1 >= r else []))
+    return clauses
@@ -0,0 +1,53 @@
+import numpy as np
+
+# Task pairs whose windows [r, d) intersect, found once per instance by a sweep over the release times.
+# Pairs with disjoint windows can never share a time step, so the D0 and D3 loops only need to visit these.
+
+
+def build_overlap_index(tasks):
+    # Returns an int array with one row (i, ip, start, end) per intersecting pair, i < ip, sorted by (i, ip),
+    # where range(start, end) = [max(r_i, r_ip), min(d_i, d_ip)) is the non-empty intersection of the windows
+    order = sorted(range(len(tasks)), key=lambda i: tasks[i][0])
+
+    pairs = []
+    active = []  # tasks already swept whose deadline is still ahead
+    for i in order:
+        release = tasks[i][0]
+        if tasks[i][2] <= release:
+            continue
+        active = [ip for ip in active if tasks[ip][2] > release]
+        for ip in active:
+            pairs.append((min(i, ip), max(i, ip)))
+        active.append(i)
+
+    index = np.zeros((len(pairs), 4), dtype=np.int64)
+    if pairs:
+        pairs.sort()
+        index[:, :2] = pairs
+        r = np.array([task[0] for task in tasks], dtype=np.int64)
+        d = np.array([task[2] for task in tasks], dtype=np.int64)
+        index[:, 2] = np.maximum(r[index[:, 0]], r[index[:, 1]])
+        index[:, 3] = np.minimum(d[index[:, 0]], d[index[:, 1]])
+    return index
+
+
+def overlap_pairs(index):
+    # (i, ip, start, end) tuples of plain ints, for the encoders that loop over the pairs
+    return [tuple(row) for row in index.tolist()]
+
+
+def window_components(tasks):
+    # Connected components of the window-intersection graph, as lists of task indices in increasing order.
+    # Windows are intervals, so a sweep by release time closes a component whenever the next window starts at
+    # or after every deadline seen so far. Tasks of different components never share a time step.
+    order = sorted(range(len(tasks)), key=lambda i: tasks[i][0])
+
+    components = []
+    end = None
+    for i in order:
+        if end is None or tasks[i][0] >= end:
+            components.append([])
+            end = tasks[i][2]
+        components[-1].append(i)
+        end = max(end, tasks[i][2])
+    return [sorted(component) for component in components]
@@ -0,0 +1,146 @@
+import sys
+import os
+import time
+import queue
+import multiprocessing
+
+from pysat.solvers import Solver
+import es3_improved
+from instances import instance_files, load_tasks
+from bounds import capacity_violation
+from presolve import tighten_windows
+from heuristic import edf_schedule, schedule_phases
+from var_pool import schedule_model
+from cnf_cache import FormulaRecorder
+
+# The same formula raced on several pysat backends.
+# Usage: python portfolio.py <family> [solver,solver,...]
+# The instance is encoded once with the es3_improved model into a CNF, or read from the cnf_cache.py cache with
+# es3_improved.cache_formulas, then every solver of the portfolio gets a copy in its own process. The first SAT
+# or UNSAT answer is taken and the other processes are terminated, so each instance costs about the time of its
+# fastest backend. The clauses are pickled to each worker, which also works under the spawn start method of
+# Windows.
+
+portfolio = ["glucose3", "cadical153", "minisat22", "maplechrono"]  # pysat solver names, one process each
+time_budget = 1200  # For the whole instance, in seconds
+resources = 200
+type = "es5_portfolio"
+id_counter = 1
+
+
+def solve_worker(name, clauses, phases, results):
+    # Runs in a worker process, puts (name, result, model) on the results queue
+    try:
+        with Solver(name=name, bootstrap_with=clauses) as sat_solver:
+            if phases:
+                sat_solver.set_phases(phases)
+            result = sat_solver.solve()
+            results.put((name, "SAT" if result else "UNSAT", sat_solver.get_model() if result else None))
+    except Exception as e:
+        results.put((name, f"ERROR: {e}", None))
+
+
+def race(clauses, phases, deadline):
+    # Returns (result, winning solver, model), the result is "Time out" when no worker answers by the deadline
+    # and "ERROR" only when every worker failed
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=solve_worker, args=(name, clauses, phases, results), daemon=True)
+               for name in portfolio]
+    for worker in workers:
+        worker.start()
+
+    answer = ("Time out", None, None)
+    errors = 0
+    for _ in workers:
+        try:
+            name, result, model = results.get(timeout=max(deadline - time.time(), 0))
+        except queue.Empty:
+            break
+        if result in ("SAT", "UNSAT"):
+            answer = (result, name, model)
+            break  # The first definitive answer decides, the other workers are cancelled
+        es3_improved.print_to_console_and_log(f"{name}: {result}")
+        errors += 1
+    if errors == len(workers):
+        answer = ("ERROR", None, None)
+
+    for worker in workers:
+        if worker.is_alive():
+            worker.terminate()
+        worker.join()
+    return answer
+
+
+def solve_instance(tasks):
+    start_time = time.time()
+    if es3_improved.bound_checks:
+        reason = capacity_violation(tasks, resources)
+        if reason is not None:
+            es3_improved.print_to_console_and_log(f"UNSAT (bounds: {reason})")
+            return "UNSAT", time.time() - start_time, "bounds", 0, 0
+    if es3_improved.presolve_windows:
+        tasks = tighten_windows(tasks, resources)
+        if tasks is None:
+            es3_improved.print_to_console_and_log("UNSAT (presolve)")
+            return "UNSAT", time.time() - start_time, "presolve", 0, 0
+
+    schedule = None
+    if es3_improved.heuristic:
+        schedule = edf_schedule(tasks, resources)
+        if all(entry is not None for entry in schedule):
+            model, u, z = schedule_model(tasks, resources, schedule)
+            if es3_improved.validate_solution(tasks, model, u, z, resources):
+                es3_improved.print_to_console_and_log("SAT (EDF)")
+                return "SAT", time.time() - start_time, "EDF", 0, 0
+
+    if es3_improved.cache_formulas:
+        clauses, u, z = es3_improved.encode_cached(tasks, resources)
+    else:
+        formula = FormulaRecorder()
+        es3_improved.sat_solver = formula
+        u, z = es3_improved.encode_problem_es3(tasks, resources)
+        clauses = formula.clauses
+    phases = schedule_phases(tasks, schedule, u, z) if schedule is not None else []
+
+    result, winner, model = race(clauses, phases, start_time + time_budget)
+    solve_time = time.time() - start_time
+
+    if result == "SAT" and not es3_improved.validate_solution(tasks, model, u, z, resources):
+        sys.exit(1)
+    num_variables = max((abs(lit) for clause in clauses for lit in clause), default=0)
+    return result, solve_time, winner, num_variables, len(clauses)
+
+
+def process_input_files(input_folder):
+    global id_counter
+
+    for file_path in instance_files(input_folder):
+        filename = os.path.basename(file_path)
+        tasks = load_tasks(file_path)
+
+        es3_improved.print_to_console_and_log(f"Processing {filename}...")
+        res, solve_time, winner, num_variables, num_clauses = solve_instance(tasks)
+        es3_improved.print_to_console_and_log(f"{res} by {winner} in {solve_time:.3f}s")
+        result_dict = {
+            "ID": id_counter,
+            "Problem": os.path.basename(filename),
+            "Type": type,
+            "Time": solve_time,
+            "Result": res,
+            "Variables": num_variables,
+            "Clauses": num_clauses,
+            "Solver": winner
+        }
+        es3_improved.write_to_xlsx(result_dict)
+        id_counter += 1
+
+
+# Main execution
+if __name__ == "__main__":
+    input_folder = "input/" + sys.argv[1]
+    if len(sys.argv) > 2:
+        portfolio = sys.argv[2].split(",")
+    process_input_files(input_folder)
+
+    es3_improved.write_report()
+    es3_improved.close_log()
@@ -0,0 +1,87 @@
+import numpy as np
+
+# Window tightening before any encoding, on the identical resources seen as one capacity of `resources`.
+# Timetable: the compulsory part [d_i - e_i, r_i + e_i) of a task runs whatever its start time. A time step
+# already filled by the compulsory parts of `resources` other tasks is closed to task i, so its window shrinks
+# to the first and last runs of e_i open time steps.
+# Energetic: a task must spend max(0, min(b - a, e, r + e - a, b - (d - e))) of its time inside [a, b).
+# If the other tasks leave less than that to task i started at its release time, it has to start later, and
+# symmetrically for the deadline. Both rules are repeated until no window changes.
+# Every z, D3 and continuity clause is built over [r_i, d_i), so narrower windows shrink every backend.
+
+
+def tighten_windows(tasks, resources, energetic=True):
+    # Returns the tightened tasks [(r, e, d), ...] in the same order, or None when no schedule can exist
+    r = np.array([task[0] for task in tasks], dtype=np.int64)
+    e = np.array([task[1] for task in tasks], dtype=np.int64)
+    d = np.array([task[2] for task in tasks], dtype=np.int64)
+
+    while True:
+        if np.any(d - r < e):
+            return None
+        before = (r.copy(), d.copy())
+        if not timetable(r, e, d, resources):
+            return None
+        if energetic and not energy(r, e, d, resources):
+            return None
+        if np.array_equal(before[0], r) and np.array_equal(before[1], d):
+            break
+
+    return [(int(r[i]), int(e[i]), int(d[i])) for i in range(len(tasks))]
+
+
+def timetable(r, e, d, resources):
+    # Shrinks r and d in place around the time steps closed by the compulsory parts, False if infeasible
+    horizon = int(d.max())
+    start, end = d - e, r + e
+    has_part = start < end
+    profile = np.zeros(horizon + 1, dtype=np.int64)
+    np.add.at(profile, start[has_part], 1)
+    np.add.at(profile, end[has_part], -1)
+    profile = np.cumsum(profile)[:horizon]
+    if np.any(profile > resources):
+        return False
+
+    for i in range(len(r)):
+        others = profile.copy()
+        if has_part[i]:
+            others[start[i]:end[i]] -= 1
+        closed = np.concatenate(([0], np.cumsum(others[r[i]:d[i]] >= resources)))
+        # open_starts[k]: the task can run in [r_i + k, r_i + k + e_i) without a closed time step
+        open_starts = np.flatnonzero(closed[e[i]:] - closed[:len(closed) - e[i]] == 0)
+        if len(open_starts) == 0:
+            return False
+        d[i] = r[i] + open_starts[-1] + e[i]
+        r[i] = r[i] + open_starts[0]
+    return True
+
+
+def energy(r, e, d, resources):
+    # Energetic checks and bound adjustments over the intervals [a, b) between event points, False if infeasible
+    points = np.unique(np.concatenate((r, d, r + e, d - e)))
+    for a in points[:-1]:
+        b = points[points > a]
+        length = b - a
+        # work[i, k]: time task i must spend inside [a, b[k])
+        work = np.minimum.reduce([
+            np.broadcast_to(length, (len(r), len(b))),
+            np.broadcast_to(e[:, None], (len(r), len(b))),
+            np.broadcast_to((r + e - a)[:, None], (len(r), len(b))),
+            b[None, :] - (d - e)[:, None],
+        ]).clip(min=0)
+        total = work.sum(axis=0)
+        if np.any(total > resources * length):
+            return False
+
+        # left[i, k], right[i, k]: time task i spends inside [a, b[k]) started at r_i, or ended at d_i
+        left = (np.minimum(r[:, None] + e[:, None], b[None, :]) - np.maximum(r[:, None], a)).clip(min=0)
+        right = (np.minimum(d[:, None], b[None, :]) - np.maximum(d[:, None] - e[:, None], a)).clip(min=0)
+        available = resources * length[None, :] - (total[None, :] - work)
+
+        # Too little room for the earliest run: the task can only leave available time steps in [a, b)
+        # by starting from b - available on, and likewise must end by a + available.
+        late = np.where(left > available, b[None, :] - available, r[:, None]).max(axis=1)
+        early = np.where(right > available, a + available, d[:, None]).min(axis=1)
+        np.maximum(r, late, out=r)
+        np.minimum(d, early, out=d)
+    return True
@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+from datetime import datetime
+
+import pandas as pd
+
+# Result rows streamed to a JSON Lines file, the Excel report is built from it in one go.
+# Usage: python result_sink.py [YYYY-MM-DD]   (builds the report of that day, today by default)
+# Appending a line costs the same for the first row of the day and the thousandth, and every row is fsynced,
+# so a crash loses at most the line being written and never corrupts the earlier ones. The rows of a day go
+# to out/results_<date>.jsonl. The report out/report_<date>.xlsx stacks them by position without a header, as
+# the workbook of write_to_xlsx did, so rows of runs with different columns sit in one sheet. Every runner's
+# write_to_xlsx appends here and its write_report builds the report once its folder is done.
+
+output_path = 'out/'
+
+
+def current_date():
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+def sink_path(date=None):
+    return os.path.join(output_path, f"results_{date or current_date()}.jsonl")
+
+
+def report_path(date=None):
+    return os.path.join(output_path, f"report_{date or current_date()}.xlsx")
+
+
+def append_row(row):
+    # Appends one result row to the file of the day, returns its path
+    if not os.path.exists(output_path): os.makedirs(output_path)
+    path = sink_path()
+    with open(path, 'a') as f:
+        f.write(json.dumps(row, default=str) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    return path
+
+
+def read_rows(date=None):
+    path = sink_path(date)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        # A line cut short by a crash is skipped
+        rows = []
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return rows
+
+
+def build_report(date=None):
+    # Writes the Excel report of a day from its rows, returns its path or None without rows
+    rows = read_rows(date)
+    if not rows:
+        return None
+    path = report_path(date)
+    df = pd.DataFrame([list(row.values()) for row in rows])
+    df.to_excel(path, index=False, sheet_name='Results', header=False)
+    return path
+
+
+# Main execution
+if __name__ == "__main__":
+    path = build_report(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"Report written to {os.path.abspath(path)}" if path else "No results to report")
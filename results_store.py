@@ -0,0 +1,48 @@
+import os
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+
+# Finished runs, so an interrupted batch resumes where it stopped.
+# A run is keyed by a SHA-256 over the task list and the run configuration (encoding settings, presolve,
+# heuristic and bound checks, solver, resources, time budget), so renaming or moving an instance file keeps its
+# results and changing any setting starts afresh.
+# Each result row is committed in its own transaction as soon as the run ends, a crash loses only the runs in
+# flight. SAT, UNSAT and time outs are done, other results (ERROR, Memory out) are retried on request.
+
+store_path = 'out/results.sqlite'
+done_results = ("SAT", "UNSAT", "Time out")
+
+
+def run_key(tasks, config):
+    payload = json.dumps({"tasks": [list(task) for task in tasks], "config": config}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def open_store(path=store_path):
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory): os.makedirs(directory)
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute("CREATE TABLE IF NOT EXISTS runs (key TEXT PRIMARY KEY, problem TEXT, config TEXT, "
+                           "result TEXT, row TEXT, finished TEXT)")
+    return connection
+
+
+def finished_row(connection, key, retry_errors=False):
+    # The stored row of a run that needs no rerun, None otherwise
+    found = connection.execute("SELECT result, row FROM runs WHERE key = ?", (key,)).fetchone()
+    if found is None:
+        return None
+    result, row = found
+    if retry_errors and result not in done_results:
+        return None
+    return json.loads(row)
+
+
+def save_row(connection, key, problem, config, row):
+    with connection:
+        connection.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                           (key, problem, json.dumps(config, sort_keys=True), row["Result"], json.dumps(row),
+                            datetime.now().isoformat(timespec='seconds')))
@@ -0,0 +1,128 @@
+import sys
+import os
+import time
+from threading import Timer
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from pysat.solvers import Glucose3
+import es3_improved
+from instances import instance_files, load_tasks
+from overlap_index import window_components
+from presolve import tighten_windows
+from var_pool import schedule_model
+
+# Independent subproblems of an instance, solved concurrently.
+# Usage: python solve_components.py <family> [workers]
+# Tasks whose windows never intersect, directly or through other tasks, never share a time step, so each
+# connected component of the window-intersection graph can use every resource on its own. Each component is
+# encoded with the es3_improved model and solved in a process pool, then the schedules are merged and the
+# whole instance is checked with es3_improved.validate_solution.
+
+resources = 200
+workers = os.cpu_count()
+time_budget = 1200  # For the whole instance, in seconds
+type = "es5_components"
+id_counter = 1
+
+
+def solve_component(tasks, resources, deadline):
+    # Runs in a worker process. Returns (result, schedule, variables, clauses) where schedule lists the
+    # (resource, start) of each task of the component, or None unless SAT
+    sat_solver = Glucose3()
+    es3_improved.sat_solver = sat_solver
+    u, z = es3_improved.encode_problem_es3(tasks, resources)
+
+    timer = Timer(max(deadline - time.time(), 0), sat_solver.interrupt)
+    timer.start()
+    result = sat_solver.solve_limited(expect_interrupt=True)
+    timer.cancel()
+
+    schedule = None
+    if result:
+        model = sat_solver.get_model()
+        schedule = [(next(j for j in range(resources) if model[u[i][j] - 1] > 0),
+                     min(t for t in z[i] if model[z[i][t] - 1] > 0)) for i in range(len(tasks))]
+    row = ("SAT" if result else "UNSAT" if result is False else "Time out", schedule,
+           sat_solver.nof_vars(), sat_solver.nof_clauses())
+    sat_solver.delete()
+    return row
+
+
+def solve_instance(pool, tasks):
+    start_time = time.time()
+    if es3_improved.presolve_windows:
+        tasks = tighten_windows(tasks, resources)
+    if tasks is None:
+        es3_improved.print_to_console_and_log("UNSAT (presolve)")
+        return "UNSAT", time.time() - start_time, 0, 0, 0
+
+    components = window_components(tasks)
+    deadline = start_time + time_budget
+    futures = {pool.submit(solve_component, [tasks[i] for i in component], resources, deadline): component
+               for component in components}
+
+    result, schedule = "SAT", [None] * len(tasks)
+    num_variables = num_clauses = 0
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=max(deadline - time.time(), 0),
+                             return_when=FIRST_COMPLETED)
+        if not done:
+            result = "Time out"
+            break
+        for future in done:
+            status, component_schedule, variables, clauses = future.result()
+            num_variables += variables
+            num_clauses += clauses
+            if status != "SAT":
+                result = status
+            else:
+                for i, entry in zip(futures[future], component_schedule):
+                    schedule[i] = entry
+        if result != "SAT":
+            break  # One UNSAT or timed out component decides the instance
+    for future in pending:
+        future.cancel()
+    solve_time = time.time() - start_time
+
+    if result == "SAT":
+        model, u, z = schedule_model(tasks, resources, schedule)
+        if not es3_improved.validate_solution(tasks, model, u, z, resources):
+            sys.exit(1)
+    return result, solve_time, len(components), num_variables, num_clauses
+
+
+def process_input_files(input_folder):
+    global id_counter
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for file_path in instance_files(input_folder):
+            filename = os.path.basename(file_path)
+            tasks = load_tasks(file_path)
+
+            es3_improved.print_to_console_and_log(f"Processing {filename}...")
+            res, solve_time, num_components, num_variables, num_clauses = solve_instance(pool, tasks)
+            es3_improved.print_to_console_and_log(f"{res}: {num_components} components in {solve_time:.3f}s")
+            result_dict = {
+                "ID": id_counter,
+                "Problem": os.path.basename(filename),
+                "Type": type,
+                "Time": solve_time,
+                "Result": res,
+                "Variables": num_variables,
+                "Clauses": num_clauses,
+                "Components": num_components
+            }
+            es3_improved.write_to_xlsx(result_dict)
+            id_counter += 1
+
+
+# Main execution
+if __name__ == "__main__":
+    input_folder = "input/" + sys.argv[1]
+    if len(sys.argv) > 2:
+        workers = int(sys.argv[2])
+    process_input_files(input_folder)
+
+    es3_improved.write_report()
+    es3_improved.close_log()
@@ -0,0 +1,42 @@
+# Value precedence over the interchangeable resources.
+# The resources are identical, so any schedule stays valid under the m! relabellings of the resources. Walking
+# the tasks in a fixed order, relabel the resources by first use: then a task may use resource j > 0 only if an
+# earlier task uses j - 1, and every class of relabelled schedules keeps exactly one member.
+# With p[k][j] = "one of the first k + 1 tasks of the order uses resource j":
+#   p[k][j] -> p[k - 1][j] v u[i_k][j]   (p[-1][j] is false)
+#   u[i_k][j] -> p[k - 1][j - 1]         (for j > 0)
+# plus u[i_k][j] -> p[k][j] and p[k - 1][j] -> p[k][j] for propagation, O(n * m) clauses over n * (m - 1) new
+# variables. p is only needed up to resource m - 2.
+
+
+def s1_tasks(tasks):
+    # The tasks S1 assigns to resources 0, 1, ... in this order (latest start <= d_min), as far as there are resources
+    d_min = min(task[2] for task in tasks)
+    return [i for i in range(len(tasks)) if tasks[i][2] - tasks[i][1] <= d_min]
+
+
+def precedence_order(tasks, fixed_tasks=None):
+    # The pinned tasks first, in the order they are pinned to resources 0, 1, ..., then the rest. By default these
+    # are the S1 tasks, S1 fixes them to distinct resources in that order, which is already a first-use labelling.
+    if fixed_tasks is None:
+        fixed_tasks = s1_tasks(tasks)
+    fixed = set(fixed_tasks)
+    return fixed_tasks + [i for i in range(len(tasks)) if i not in fixed]
+
+
+def value_precedence_clauses(vpool, u, order, name='p'):
+    # Clauses over u, with p[k][j] numbered from the pool under keys (name, k, j)
+    resources = len(u[0]) if u else 0
+    p = [[vpool.id((name, k, j)) for j in range(resources - 1)] for k in range(len(order))]
+
+    clauses = []
+    for k, i in enumerate(order):
+        for j in range(resources):
+            if j < resources - 1:
+                clauses.append([-u[i][j], p[k][j]])
+                clauses.append([-p[k][j], u[i][j]] + ([p[k - 1][j]] if k > 0 else []))
+                if k > 0:
+                    clauses.append([-p[k - 1][j], p[k][j]])
+            if j > 0:
+                clauses.append([-u[i][j]] + ([p[k - 1][j - 1]] if k > 0 else []))
+    return clauses
@@ -0,0 +1,24 @@
+import es3_improved_pb_block_kminus1 as kminus1
+
+# Zero-slack windows (d - r == e) reach block_encoding from the input or from the presolve tightening.
+
+
+def test_block_encoding_zero_slack():
+    clauses, var_index = kminus1.block_encoding([0, 11, 12, 13], 3, 20)
+    assert clauses == [[11], [12], [13]]
+    assert var_index == 20
+
+
+def test_presolve_zero_slack_instance_is_sat():
+    # The presolve narrows the last task to (3, 2, 5), a window of exactly its duration
+    tasks = [(4, 2, 7), (2, 1, 4), (2, 1, 4), (2, 1, 4), (2, 2, 5)]
+    result, _, _, _ = kminus1.solve_es3(tasks, 2)
+    assert result == "SAT"
+
+
+def test_presolve_instance_has_a_single_run(monkeypatch):
+    # Without the all zero block a task could run again after its first run, the schedule failed validation
+    monkeypatch.setattr(kminus1, "presolve_windows", True)
+    tasks = [(9, 1, 10), (4, 1, 8), (2, 1, 3), (8, 1, 9), (2, 5, 10), (5, 5, 10), (0, 2, 4)]
+    result, _, _, _ = kminus1.solve_es3(tasks, 2)
+    assert result == "SAT"
@@ -0,0 +1,49 @@
+import importlib
+import random
+
+import pytest
+
+import es3_improved
+from symmetry import s1_tasks
+
+# The block encodings of the pb_block, kminus1 and blockrd scripts against es3_improved, SAT/UNSAT on small random
+# instances with the presolve on and off.
+# The S1 of these scripts pins the latest-start <= d_min tasks to distinct resources, which is only implied when
+# their compulsory parts [d - e, r + e) share a time step, so the instances are drawn among those.
+
+scripts = ["es3_improved_pb_block", "es3_improved_pb_block_kminus1", "es3_improved_pb_block_reduce",
+           "es3_improved_pb_blockrd_mapple", "es3_improved_pb_blockrd_minisat", "es3_improved_CaDiCal_bi_blockrd",
+           "es3_improved_CaDiCal_pb_blockrd"]
+
+
+def random_instances(seed, count):
+    rnd = random.Random(seed)
+    instances = []
+    while len(instances) < count:
+        tasks = []
+        for _ in range(rnd.randint(2, 7)):
+            r, e = rnd.randint(0, 8), rnd.randint(1, 4)
+            tasks.append((r, e, r + e + rnd.randint(0, 4)))
+        resources = rnd.randint(1, 3)
+        pinned = [tasks[i] for i in s1_tasks(tasks)[:resources]]
+        if max(d - e for r, e, d in pinned) < min(r + e for r, e, d in pinned):
+            instances.append((tasks, resources))
+    return instances
+
+
+def test_reported_instance(monkeypatch):
+    # The first block auxiliary reused the last variable before the blocks, this one came back UNSAT
+    script = importlib.import_module("es3_improved_pb_block")
+    monkeypatch.setattr(script, "presolve_windows", False)
+    result, _, _, _ = script.solve_es3([(0, 3, 6), (6, 3, 10), (9, 1, 10), (4, 2, 6), (8, 3, 11), (4, 1, 5), (0, 3, 6)], 2)
+    assert result == "SAT"
+
+
+@pytest.mark.parametrize("name", scripts)
+@pytest.mark.parametrize("presolve", [False, True])
+def test_block_results_match_es3_improved(name, presolve, monkeypatch):
+    script = importlib.import_module(name)
+    monkeypatch.setattr(script, "presolve_windows", presolve)
+    monkeypatch.setattr(es3_improved, "isolate_solves", False)
+    for tasks, resources in random_instances(3, 40):
+        assert script.solve_es3(tasks, resources)[0] == es3_improved.solve_es3(tasks, resources)[0], (tasks, resources)
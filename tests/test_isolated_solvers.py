@@ -0,0 +1,33 @@
+import importlib
+
+import pytest
+
+pytest.importorskip("ortools")
+
+# The OR-Tools scripts solve in a child process (isolated.py), so their result containers hold plain values.
+# The child and the in-thread solve agree, and the child is stopped at the time budget.
+
+scripts = ["es3_improved_ortools_cp", "es3_improved_ortools_mip"]
+instances = [([(0, 2, 4), (1, 2, 5), (2, 1, 6), (3, 2, 7)], 2),
+             ([(0, 1, 3), (0, 1, 3), (0, 1, 3), (1, 2, 5)], 2),
+             ([(0, 3, 4), (1, 3, 4), (0, 2, 3)], 2)]
+
+
+@pytest.mark.parametrize("name", scripts)
+def test_isolated_matches_thread(name, monkeypatch):
+    script = importlib.import_module(name)
+    monkeypatch.setattr(script, "presolve_windows", False)
+    for tasks, resources in instances:
+        monkeypatch.setattr(script, "isolate_solves", True)
+        isolated = script.solve_es3(tasks, resources)
+        monkeypatch.setattr(script, "isolate_solves", False)
+        thread = script.solve_es3(tasks, resources)
+        assert (isolated[0], isolated[2:]) == (thread[0], thread[2:]), tasks
+
+
+@pytest.mark.parametrize("name", scripts)
+def test_isolated_time_out(name, monkeypatch):
+    script = importlib.import_module(name)
+    monkeypatch.setattr(script, "time_budget", 0)
+    result, _, _, _ = script.solve_es3([(0, 2, 4), (1, 2, 5), (2, 1, 6), (3, 2, 7)], 2)
+    assert result == "TIMEOUT"
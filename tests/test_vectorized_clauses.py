@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+import vectorized_clauses
+from vectorized_clauses import d0_clauses, d3_clauses
+from overlap_index import build_overlap_index
+
+# The NumPy D0/D3 blocks against the nested loops they replaced, on the fixed variable numbering of the
+# original encode_problem_es3 (u[i][j] = i * resources + j + 1, z[i][t] over the whole of range(d_i)).
+
+
+def check_overlap(task1, task2):
+    if task2[0] + task2[1] > task1[2] - task1[1] and task2[2] - task2[1] < task1[0] + task1[1]:
+        return True
+    if task1[0] + task1[1] > task2[2] - task2[1] and task1[2] - task1[1] < task2[0] + task2[1]:
+        return True
+    return False
+
+
+def random_tasks(rnd, n, horizon):
+    tasks = []
+    for _ in range(n):
+        r = rnd.randrange(horizon - 1)
+        e = rnd.randint(1, min(6, horizon - r))
+        tasks.append((r, e, rnd.randint(r + e, horizon)))
+    return tasks
+
+
+def fixed_variables(tasks, resources):
+    max_time = max(task[2] for task in tasks)
+    u = [[i * resources + j + 1 for j in range(resources)] for i in range(len(tasks))]
+    z = [{t: len(tasks) * resources + i * max_time + t + 1 for t in range(task[2])} for i, task in enumerate(tasks)]
+    return u, z
+
+
+def loop_d0(tasks, u, resources):
+    clauses = []
+    for i in range(len(tasks)):
+        for ip in range(i + 1, len(tasks)):
+            if check_overlap(tasks[i], tasks[ip]):
+                for j in range(resources):
+                    clauses.append([-u[i][j], -u[ip][j]])
+    return clauses
+
+
+def loop_d3(tasks, u, z, resources):
+    clauses = []
+    for i in range(len(tasks)):
+        for ip in range(i + 1, len(tasks)):
+            for j in range(resources):
+                for t in range(tasks[i][0], min(tasks[i][2], tasks[ip][2])):
+                    clauses.append([-z[i][t], -u[i][j], -z[ip][t], -u[ip][j]])
+    return clauses
+
+
+def clause_set(blocks):
+    return sorted(tuple(clause) for block in blocks for clause in block.tolist())
+
+
+instances = [(seed, n, horizon, resources) for seed, (n, horizon, resources) in
+             enumerate([(2, 6, 1), (5, 10, 2), (8, 15, 3), (12, 20, 2), (16, 10, 3), (20, 30, 4), (30, 40, 5)])]
+
+
+@pytest.mark.parametrize("seed, n, horizon, resources", instances)
+def test_d0_matches_loop(seed, n, horizon, resources):
+    tasks = random_tasks(random.Random(seed), n, horizon)
+    u, _ = fixed_variables(tasks, resources)
+    expected = sorted(tuple(clause) for clause in loop_d0(tasks, u, resources))
+    assert clause_set([d0_clauses(tasks, u, build_overlap_index(tasks))]) == expected
+
+
+@pytest.mark.parametrize("seed, n, horizon, resources", instances)
+def test_d3_matches_loop(seed, n, horizon, resources, monkeypatch):
+    # Small chunks so the larger instances are generated over several arrays
+    monkeypatch.setattr(vectorized_clauses, "chunk_size", 64)
+    tasks = random_tasks(random.Random(seed), n, horizon)
+    u, z = fixed_variables(tasks, resources)
+    # The loop also covered t < r_ip, where z[ip][t] lies outside the window of ip and no other clause uses it.
+    # The overlap index leaves those out, every other clause must be the same.
+    in_window = {z[i][t] for i, task in enumerate(tasks) for t in range(task[0], task[2])}
+    expected = sorted(tuple(clause) for clause in loop_d3(tasks, u, z, resources) if -clause[2] in in_window)
+    assert clause_set(d3_clauses(tasks, u, z, build_overlap_index(tasks))) == expected
@@ -0,0 +1,58 @@
+from pysat.formula import IDPool
+
+# Dense variable numbering for the SAT encodings, on top of a pysat IDPool.
+# The fixed formulas (z[i][t] = n * resources + i * max_time + t + 1, ...) number every t in range(max_time)
+# and resume the auxiliary variables after n * resources + n * max_time, so the solver allocated its per-variable
+# arrays for many IDs that no clause uses. Here IDs are handed out contiguously in creation order, only for
+# the time steps inside each task window, and the pool keeps the reverse map from an ID to its key.
+
+
+def new_pool():
+    return IDPool()
+
+
+def resource_variables(vpool, n, resources, name='u'):
+    # u[i][j] for task i accessing resource j, keys (name, i, j)
+    return [[vpool.id((name, i, j)) for j in range(resources)] for i in range(n)]
+
+
+def time_variables(vpool, tasks, name='z'):
+    # z[i][t] for t in the window [r_i, d_i), keys (name, i, t).
+    # One dict per task, so a time step outside the window raises a KeyError instead of reading another variable.
+    return [{t: vpool.id((name, i, t)) for t in range(task[0], task[2])} for i, task in enumerate(tasks)]
+
+
+def start_variables(vpool, tasks, name='s', resources=None):
+    # s[i][t] for the possible start times t in [r_i, d_i - e_i], keys (name, i, t).
+    # With resources, D[i][j][t] per resource j instead, keys (name, i, j, t).
+    if resources is None:
+        return [{t: vpool.id((name, i, t)) for t in range(task[0], task[2] - task[1] + 1)}
+                for i, task in enumerate(tasks)]
+    return [[{t: vpool.id((name, i, j, t)) for t in range(task[0], task[2] - task[1] + 1)} for j in range(resources)]
+            for i, task in enumerate(tasks)]
+
+
+def order_variables(vpool, tasks, name='o'):
+    # o[i][t] meaning "task i starts at or before t", for t in [r_i, d_i - e_i - 1], keys (name, i, t).
+    # It is false before r_i and true from the latest start d_i - e_i on, so those time steps have no variable.
+    return [{t: vpool.id((name, i, t)) for t in range(task[0], task[2] - task[1])} for i, task in enumerate(tasks)]
+
+
+def schedule_model(tasks, resources, schedule):
+    # Model over a fresh pool for a schedule given as the (resource, start) of every task, with its u and z,
+    # so a schedule found without the solver can be checked by validate_solution
+    vpool = new_pool()
+    u = resource_variables(vpool, len(tasks), resources)
+    z = time_variables(vpool, tasks)
+    model = [-v for v in range(1, vpool.top + 1)]
+    for i, (j, start) in enumerate(schedule):
+        model[u[i][j] - 1] = u[i][j]
+        for t in range(start, start + tasks[i][1]):
+            model[z[i][t] - 1] = z[i][t]
+    return model, u, z
+
+
+def decode_model(vpool, model):
+    # Keys of the pool variables set to true in a model, e.g. ('u', i, j) or ('z', i, t).
+    # Auxiliary variables of the cardinality encodings are numbered after vpool.top and skipped.
+    return [vpool.obj(lit) for lit in model if 0 < lit <= vpool.top]
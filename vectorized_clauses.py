@@ -0,0 +1,128 @@
+import gc
+import numpy as np
+
+# Clause blocks of encode_problem_es3 built as whole int32 arrays instead of nested Python loops.
+# The pairs come from overlap_index.build_overlap_index(), within a pair the rows follow the order of the original loops.
+
+chunk_size = 1 << 22  # Number of clauses generated per array
+batch_size = 1 << 16  # Number of clauses converted and handed to the solver per call
+
+
+def task_arrays(tasks):
+    tasks = np.asarray(tasks, dtype=np.int32).reshape(-1, 3)
+    return tasks[:, 0], tasks[:, 1], tasks[:, 2]
+
+
+def variable_arrays(tasks, u, z):
+    # u is a full n x resources table, z[i] maps each t in the window [r_i, d_i) to its variable (var_pool.time_variables)
+    U = np.asarray(u, dtype=np.int32).reshape(len(tasks), -1)
+    Z = np.zeros((len(tasks), max(task[2] for task in tasks)), dtype=np.int32)
+    for i, z_i in enumerate(z):
+        Z[i, list(z_i)] = list(z_i.values())
+    return U, Z
+
+
+def check_overlap(tasks, i, ip):
+    # Same test as check_overlap(task1, task2) in the scripts, for arrays of task indices
+    r, e, d = task_arrays(tasks)
+    first = (r[ip] + e[ip] > d[i] - e[i]) & (d[ip] - e[ip] < r[i] + e[i])
+    second = (r[i] + e[i] > d[ip] - e[ip]) & (d[i] - e[i] < r[ip] + e[ip])
+    return first | second
+
+
+def d0_clauses(tasks, u, index):
+    # D0: -u[i][j] v -u[ip][j] for every pair that must overlap and every resource j.
+    # Pairs that must overlap always have intersecting windows, so only the pairs of the overlap index are tested.
+    U = np.asarray(u, dtype=np.int32).reshape(len(tasks), -1)
+    i, ip = index[:, 0], index[:, 1]
+    overlap = check_overlap(tasks, i, ip)
+    i, ip = i[overlap], ip[overlap]
+
+    clauses = np.empty((len(i), U.shape[1], 2), dtype=np.int32)
+    clauses[:, :, 0] = -U[i]
+    clauses[:, :, 1] = -U[ip]
+    return clauses.reshape(-1, 2)
+
+
+def d3_clauses(tasks, u, z, index):
+    # D3: -z[i][t] v -u[i][j] v -z[ip][t] v -u[ip][j] for every pair of the overlap index, every j and
+    # t in range(max(r_i, r_ip), min(d_i, d_ip)).
+    # Yields arrays of at most about chunk_size rows so memory stays bounded on the huge instances.
+    U, Z = variable_arrays(tasks, u, z)
+    resources = U.shape[1]
+
+    sizes = (index[:, 3] - index[:, 2]) * resources
+    ends = np.cumsum(sizes)
+    first = 0
+    while first < len(index):
+        # Take pairs until the chunk is full, at least one pair per chunk
+        last = max(int(np.searchsorted(ends, ends[first] - sizes[first] + chunk_size, side='right')), first + 1)
+        i, ip, start, end = index[first:last].T
+        lengths = end - start
+        block_sizes = sizes[first:last]
+        total = int(block_sizes.sum())
+
+        # Clause k of the block for a pair is resource k // length, time start + k % length
+        pair = np.repeat(np.arange(last - first), block_sizes)
+        k = np.arange(total) - np.repeat(np.cumsum(block_sizes) - block_sizes, block_sizes)
+        j = k // lengths[pair]
+        t = start[pair] + k % lengths[pair]
+
+        clauses = np.empty((total, 4), dtype=np.int32)
+        clauses[:, 0] = -Z[i[pair], t]
+        clauses[:, 1] = -U[i[pair], j]
+        clauses[:, 2] = -Z[ip[pair], t]
+        clauses[:, 3] = -U[ip[pair], j]
+        yield clauses
+        first = last
+
+
+def d3_pair_clauses(tasks, u, z, index, id_variable):
+    # D3 with one literal s[i][ip] per pair of the overlap index, meaning "i and ip are on the same resource":
+    #   -u[i][j] v -u[ip][j] v s[i][ip]             for every resource j
+    #   -z[i][t] v -z[ip][t] v -s[i][ip]            for t in range(max(r_i, r_ip), min(d_i, d_ip))
+    # so the time part no longer grows with the number of resources.
+    # id_variable is the last used variable, returns the clause arrays and the new last used variable.
+    U, Z = variable_arrays(tasks, u, z)
+    resources = U.shape[1]
+
+    i, ip, start, end = index.T
+    lengths = end - start
+    s = (id_variable + 1 + np.arange(len(i))).astype(np.int32)
+
+    link = np.empty((len(i), resources, 3), dtype=np.int32)
+    link[:, :, 0] = -U[i]
+    link[:, :, 1] = -U[ip]
+    link[:, :, 2] = s[:, None]
+
+    total = int(lengths.sum())
+    pair = np.repeat(np.arange(len(i)), lengths)
+    t = start[pair] + np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+    conflict = np.empty((total, 3), dtype=np.int32)
+    conflict[:, 0] = -Z[i[pair], t]
+    conflict[:, 1] = -Z[ip[pair], t]
+    conflict[:, 2] = -s[pair]
+
+    return [link.reshape(-1, 3), conflict], id_variable + len(i)
+
+
+def add_clauses(sat_solver, clauses):
+    # Hand a clause array (or a generator of them) to the solver in bulk, returns the number of clauses
+    if isinstance(clauses, np.ndarray):
+        clauses = [clauses]
+
+    # pysat only takes Python lists, convert in slices so the whole block is never held as lists.
+    # The lists are freed by reference counting, so the cyclic collector is paused meanwhile.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        num_clauses = 0
+        for block in clauses:
+            for k in range(0, len(block), batch_size):
+                sat_solver.append_formula(block[k:k + batch_size].tolist())
+            num_clauses += len(block)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return num_clauses